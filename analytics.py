@@ -0,0 +1,222 @@
+import argparse
+import json
+import os
+import random
+import threading
+
+SKETCH_K = 200 # KLL accuracy: rank error is about 1.7 / K, memory about 3 * K values
+SNAPSHOT_EVERY = 100 # settled rounds between the app's snapshots to disk
+
+class Moments:
+    # Welford's running mean and sum of squared deviations; merge() is Chan's pairwise update
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other):
+        count = self.count + other.count
+        if not other.count:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+class QuantileSketch:
+    # KLL sketch: compactors[h] holds items that each stand for 2**h inputs. A full compactor
+    # is sorted and every other item (from a random offset) moves up a level, so memory stays
+    # near 3 * k items however many values go in, and two sketches merge level by level.
+    def __init__(self, k=SKETCH_K, rng=None):
+        self.k = k
+        self.count = 0
+        self.compactors = [[]]
+        self.rng = rng if rng is not None else random.Random()
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, height):
+        depth = len(self.compactors) - height - 1
+        return max(2, int(self.k * (2 / 3) ** depth) + 1)
+
+    def add(self, x):
+        self.compactors[0].append(x)
+        self.count += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self):
+        while self._size >= self._max_size:
+            for height, items in enumerate(self.compactors):
+                if len(items) >= self._capacity(height):
+                    if height + 1 == len(self.compactors):
+                        self.compactors.append([])
+                    items.sort()
+                    carry = items.pop() if len(items) % 2 else None
+                    promoted = items[self.rng.random() < 0.5::2]
+                    self.compactors[height + 1].extend(promoted)
+                    self._size -= len(items) - len(promoted)
+                    items[:] = [] if carry is None else [carry]
+                    break
+            self._max_size = sum(self._capacity(height) for height in range(len(self.compactors)))
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for height, items in enumerate(other.compactors):
+            self.compactors[height].extend(items)
+        self.count += other.count
+        self._resize()
+        self._compress()
+
+    def _resize(self):
+        self._size = sum(len(items) for items in self.compactors)
+        self._max_size = sum(self._capacity(height) for height in range(len(self.compactors)))
+
+    @classmethod
+    def restore(cls, k, count, compactors):
+        sketch = cls(k)
+        sketch.count = count
+        sketch.compactors = [list(items) for items in compactors] or [[]]
+        sketch._resize()
+        return sketch
+
+    def quantile(self, q):
+        weighted = sorted((x, 1 << height) for height, items in enumerate(self.compactors) for x in items)
+        if not weighted:
+            return None
+        target = q * sum(weight for _, weight in weighted)
+        seen = 0
+        for x, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return x
+        return weighted[-1][0]
+
+class RoundStats:
+    # Constant-memory summary of settled rounds: stake and payout totals (RTP), moments of
+    # the return per coin bet, rounds ended per level by a bust or a cash-out (the jackpot is
+    # cash_outs[levels]) and a quantile sketch of win sizes. record() holds the lock only for
+    # a few updates, and queries run on a copy from snapshot(), so neither stalls the other.
+    def __init__(self, variant_name, levels, k=SKETCH_K):
+        self.variant_name = variant_name
+        self.levels = levels
+        self.rounds = 0
+        self.staked = 0
+        self.paid = 0
+        self.returns = Moments()
+        self.busts = [0] * (levels + 1) # by levels cleared before the DEAD tile
+        self.cash_outs = [0] * (levels + 1) # by levels cleared when paid
+        self.wins = QuantileSketch(k)
+        self._lock = threading.Lock()
+
+    def record(self, bet, paid, cleared, count=1):
+        # count settles several identical rounds at once, e.g. boards of a parallel bet
+        with self._lock:
+            self.rounds += count
+            self.staked += bet * count
+            self.paid += paid * count
+            for _ in range(count):
+                self.returns.add(paid / bet)
+                if paid:
+                    self.wins.add(paid)
+            if paid:
+                self.cash_outs[cleared] += count
+            else:
+                self.busts[cleared] += count
+
+    def merge(self, other):
+        if (other.variant_name, other.levels) != (self.variant_name, self.levels):
+            raise ValueError(f'Cannot merge {other.variant_name} stats into {self.variant_name}')
+        with self._lock:
+            self.rounds += other.rounds
+            self.staked += other.staked
+            self.paid += other.paid
+            self.returns.merge(other.returns)
+            self.busts = [a + b for a, b in zip(self.busts, other.busts)]
+            self.cash_outs = [a + b for a, b in zip(self.cash_outs, other.cash_outs)]
+            self.wins.merge(other.wins)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'variant': self.variant_name,
+                'levels': self.levels,
+                'rounds': self.rounds,
+                'staked': self.staked,
+                'paid': self.paid,
+                'returns': [self.returns.count, self.returns.mean, self.returns.m2],
+                'busts': self.busts[:],
+                'cash_outs': self.cash_outs[:],
+                'sketch': {'k': self.wins.k, 'count': self.wins.count, 'compactors': [items[:] for items in self.wins.compactors]},
+            }
+
+    @classmethod
+    def from_snapshot(cls, data):
+        stats = cls(data['variant'], data['levels'], data['sketch']['k'])
+        stats.rounds = data['rounds']
+        stats.staked = data['staked']
+        stats.paid = data['paid']
+        stats.returns = Moments(*data['returns'])
+        stats.busts = data['busts']
+        stats.cash_outs = data['cash_outs']
+        stats.wins = QuantileSketch.restore(**data['sketch'])
+        return stats
+
+    def save(self, path):
+        # the copy is taken under the lock; the write happens outside it
+        payload = json.dumps(self.snapshot(), separators=(',', ':'))
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_snapshot(json.load(f))
+
+    def report(self):
+        stats = RoundStats.from_snapshot(self.snapshot())
+        if not stats.rounds:
+            return f'{stats.variant_name}: no rounds'
+        p50, p99 = stats.wins.quantile(0.5), stats.wins.quantile(0.99)
+        lines = [
+            f'{stats.variant_name}: {stats.rounds:,} rounds, RTP {stats.paid / stats.staked:.4f} '
+            f'({stats.paid:,} paid on {stats.staked:,} staked)',
+            f'return per coin: mean {stats.returns.mean:.4f} variance {stats.returns.variance:.4f}',
+            f'win size: p50 {p50} p99 {p99} ({stats.wins.count:,} wins)',
+            'levels cleared  busts  cash-outs',
+        ]
+        for cleared in range(stats.levels + 1):
+            lines.append(f'{cleared:14d} {stats.busts[cleared]:6,} {stats.cash_outs[cleared]:10,}')
+        return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge RoundStats snapshots (one per process) and print the totals')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--output', default=None, help='also save the merged snapshot here')
+    args = parser.parse_args()
+
+    merged = RoundStats.load(args.paths[0])
+    for path in args.paths[1:]:
+        merged.merge(RoundStats.load(path))
+    print(merged.report())
+    if args.output:
+        merged.save(args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import os
+import time
+from collections import deque
+
+VOICES = 4 # overlapping copies of a sample; a fifth rapid click restarts the oldest
+LATENCY_SAMPLES = 4096 # trigger-to-start latencies kept for stats()
+AUDIO_BACKEND = os.environ.get('SAFE_OR_DEAD_AUDIO', 'kivy') # 'null' for headless runs
+
+class NullVoice:
+    # stands in for a Kivy Sound where there is no audio device, or none is wanted
+    length = 0
+
+    def play(self):
+        pass
+
+    def stop(self):
+        pass
+
+def load_voices(path, voices=VOICES, backend=AUDIO_BACKEND):
+    # every voice is loaded (and decoded) here, at preload time, never on a click. Kivy's
+    # Sound owns its decoded sample and one mixer channel, and play() restarts it, so
+    # overlapping clicks need separate instances and the sample is decoded once per voice
+    # (about 0.4 ms each for the click here)
+    if backend == 'null':
+        return [NullVoice() for _ in range(voices)]
+    from kivy.core.audio import SoundLoader
+    sounds = [SoundLoader.load(path) for _ in range(voices)]
+    if any(sound is None for sound in sounds):
+        return [NullVoice() for _ in range(voices)]
+    return sounds
+
+class VoicePool:
+    # A few preloaded voices of one sample. Everything runs on the UI thread: Sound.play()
+    # and stop() set Kivy properties and dispatch events, which is only safe there.
+    # trigger(), called from a click handler, only timestamps a request and arms a Clock
+    # trigger; the trigger fires before this frame is drawn, picks an idle voice (or
+    # restarts the oldest) and starts it, recording the latency from trigger to play()
+    # returning.
+    def __init__(self, voices):
+        from kivy.clock import Clock
+        self.voices = list(voices)
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.played = 0
+        self.steals = 0
+        # a voice is busy until its sample has had time to finish; Sound.state lags a
+        # restart until the Clock updates it
+        self._lengths = [voice.length for voice in self.voices]
+        self._started = [float('-inf')] * len(self.voices)
+        self._requests = deque()
+        self._start_requested = Clock.create_trigger(self._play_requested, -1)
+
+    def trigger(self):
+        self._requests.append(time.perf_counter())
+        self._start_requested()
+
+    def _play_requested(self, dt):
+        while self._requests:
+            self._play(self._requests.popleft())
+
+    def _play(self, requested):
+        voices = self.voices
+        now = time.perf_counter()
+        index = next((i for i, started in enumerate(self._started) if now - started >= self._lengths[i]), None)
+        if index is None:
+            index = min(range(len(voices)), key=self._started.__getitem__)
+            voices[index].stop()
+            self.steals += 1
+        voices[index].play()
+        started = time.perf_counter()
+        self._started[index] = started
+        self.latencies.append(started - requested)
+        self.played += 1
+
+    def stats(self):
+        # (sounds played, voices stolen, p50, p99, max trigger-to-start latency in seconds)
+        samples = sorted(self.latencies)
+        if not samples:
+            return self.played, self.steals, 0.0, 0.0, 0.0
+        return (self.played, self.steals, samples[len(samples) // 2],
+                samples[min(len(samples) - 1, int(len(samples) * 0.99))], samples[-1])
+
+    def close(self):
+        self._start_requested.cancel()
+        self._requests.clear()
@@ -0,0 +1,150 @@
+import argparse
+import random
+import time
+from array import array
+from collections import namedtuple
+
+from engine import DEFAULT_BET, GameEngine, GameState, PickResult, load_variants
+
+# balances[k] is the balance after round k * record_every; resets counts refills after going broke
+AutoplayResult = namedtuple('AutoplayResult', 'rounds seconds balances resets')
+
+class Strategy:
+    # Sizes each bet, picks tiles and decides when to cash out. cash_out() is asked before
+    # every pick once a level is cleared; settle() hears whether the round paid anything.
+    name = 'random'
+
+    def __init__(self, bet=DEFAULT_BET):
+        self.base_bet = bet
+
+    def bet(self, engine):
+        return self.base_bet
+
+    def pick(self, engine, rng):
+        return rng.randrange(engine.variant.tiles)
+
+    def cash_out(self, engine):
+        return False
+
+    def settle(self, won):
+        pass
+
+class FixedCashOut(Strategy):
+    name = 'fixed'
+
+    def __init__(self, level, bet=DEFAULT_BET):
+        super().__init__(bet)
+        self.level = level
+
+    def cash_out(self, engine):
+        return engine.level - 1 >= self.level
+
+class EvGreedy(Strategy):
+    # one-step lookahead on the variant tables: climb while the next level's expected
+    # payout beats what cashing out pays now
+    name = 'ev-greedy'
+
+    def cash_out(self, engine):
+        variant = engine.variant
+        level = engine.level - 1
+        next_payout = variant.payouts[engine.bet_amount * variant.levels + level]
+        return variant.survival[level] * next_payout <= engine.current_winnings
+
+class Martingale(FixedCashOut):
+    # doubles the stake after every loss and drops back to the base bet after a win
+    name = 'martingale'
+
+    def __init__(self, level, bet=DEFAULT_BET, factor=2):
+        super().__init__(level, bet)
+        self.factor = factor
+        self.stake = bet
+
+    def bet(self, engine):
+        return self.stake
+
+    def settle(self, won):
+        self.stake = self.base_bet if won else self.stake * self.factor
+
+def parse_strategy(spec, bet=DEFAULT_BET):
+    # 'fixed:3', 'ev-greedy', 'martingale:2' (the number is the cash-out level)
+    name, _, level = spec.partition(':')
+    if name == FixedCashOut.name:
+        return FixedCashOut(int(level or 3), bet)
+    if name == EvGreedy.name:
+        return EvGreedy(bet)
+    if name == Martingale.name:
+        return Martingale(int(level or 1), bet)
+    if name == Strategy.name:
+        return Strategy(bet)
+    raise ValueError(f'Unknown strategy: {spec}')
+
+def next_bet(engine, strategy):
+    # the strategy's stake, trimmed to what the balance and the table allow
+    return min(strategy.bet(engine), engine.balance, engine.variant.max_bet)
+
+def play(engine, strategy, rounds, rng=None, reset_when_broke=True, record_every=1):
+    # Plays whole rounds through the engine at full speed, the same start/pick/cash-out
+    # steps GameScreen takes, minus the animation delays
+    rng = rng if rng is not None else random.Random()
+    balances = array('q')
+    resets = 0
+    played = 0
+    start = time.perf_counter()
+    while played < rounds:
+        bet = next_bet(engine, strategy)
+        if bet < 1:
+            if not reset_when_broke:
+                break
+            engine.reset_balance()
+            resets += 1
+            continue
+
+        engine.start_round(bet)
+        result = PickResult.SAFE
+        while engine.game_state == GameState.ACTIVE:
+            if engine.level > 1 and strategy.cash_out(engine):
+                engine.cash_out()
+                break
+            result = engine.pick(strategy.pick(engine, rng))
+        strategy.settle(result != PickResult.DEAD)
+        engine.reset_round()
+
+        played += 1
+        if played % record_every == 0:
+            balances.append(engine.balance)
+    return AutoplayResult(played, time.perf_counter() - start, balances, resets)
+
+def report(strategy, result):
+    balances = result.balances
+    lines = [f'{strategy.name:10s} {result.rounds:,} rounds in {result.seconds:.2f}s '
+             f'({result.rounds / result.seconds:,.0f} rounds/s), {result.resets:,} balance resets']
+    if balances:
+        lines.append(f'{"":10s} balance: final {balances[-1]:,} min {min(balances):,} max {max(balances):,}')
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description='Autoplay SAFE or DEAD rounds headless with a betting strategy')
+    parser.add_argument('--strategy', action='append', default=None,
+                        help="fixed:LEVEL, ev-greedy, martingale:LEVEL or random; repeat to compare")
+    parser.add_argument('--rounds', type=lambda x: int(float(x)), default=100_000)
+    parser.add_argument('--bet', type=int, default=DEFAULT_BET)
+    parser.add_argument('--variant', default='classic')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--trajectory', default=None, help='write round,balance CSV per strategy to PREFIX-NAME.csv')
+    parser.add_argument('--record-every', type=int, default=1)
+    args = parser.parse_args()
+
+    variant = load_variants()[args.variant]
+    for spec in args.strategy or ['fixed:3', 'ev-greedy', 'martingale:1']:
+        strategy = parse_strategy(spec, args.bet)
+        engine = GameEngine(rng=random.Random(args.seed), variant=variant)
+        result = play(engine, strategy, args.rounds, random.Random(args.seed), record_every=args.record_every)
+        print(report(strategy, result))
+        if args.trajectory:
+            with open(f'{args.trajectory}-{spec.replace(":", "")}.csv', 'w') as f:
+                f.write('round,balance\n')
+                for k, balance in enumerate(result.balances, 1):
+                    f.write(f'{k * args.record_every},{balance}\n')
+
+if __name__ == '__main__':
+    main()
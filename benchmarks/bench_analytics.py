@@ -0,0 +1,84 @@
+import argparse
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from analytics import RoundStats
+from engine import CLASSIC, resolve_rounds
+
+def rounds(n, seed):
+    # (bets, payouts, levels cleared) for n rounds with random bets and cash-out levels
+    rng = np.random.default_rng(seed)
+    bets = rng.integers(1, 101, size=n)
+    cash_out_levels = rng.integers(1, CLASSIC.levels + 1, size=n)
+    cleared, payouts = resolve_rounds(bets, cash_out_levels, rng, CLASSIC)
+    return bets.tolist(), payouts.tolist(), cleared.tolist()
+
+def ingest(n, seed):
+    stats = RoundStats(CLASSIC.name, CLASSIC.levels)
+    for bet, paid, cleared in zip(*rounds(n, seed)):
+        stats.record(bet, paid, cleared)
+    return stats.snapshot()
+
+def main():
+    parser = argparse.ArgumentParser(description='RoundStats ingestion rate, memory, sketch accuracy and merging')
+    parser.add_argument('--rounds', type=lambda x: int(float(x)), default=1_000_000)
+    parser.add_argument('--processes', type=int, default=4)
+    args = parser.parse_args()
+
+    bets, payouts, cleared = rounds(args.rounds, 0)
+    stats = RoundStats(CLASSIC.name, CLASSIC.levels)
+    sizes = {}
+    start = time.perf_counter()
+    for i, (bet, paid, level) in enumerate(zip(bets, payouts, cleared), 1):
+        stats.record(bet, paid, level)
+        if i in (10_000, 100_000, 1_000_000, 10_000_000):
+            sizes[i] = stats.wins._size
+    elapsed = time.perf_counter() - start
+    print(f'ingest: {args.rounds / elapsed:,.0f} rounds/s ({elapsed / args.rounds * 1e9:.0f} ns/round)')
+    print('sketch items kept: ' + ', '.join(f'{size:,} after {n:,} rounds' for n, size in sizes.items()))
+
+    wins = np.array([paid for paid in payouts if paid])
+    for q in (0.5, 0.99):
+        estimate = stats.wins.quantile(q)
+        print(f'win size p{q * 100:g}: sketch {estimate} exact {np.quantile(wins, q):.0f} '
+              f'(sketch value sits at rank {np.mean(wins <= estimate):.4f})')
+    exact_rtp = sum(payouts) / sum(bets)
+    print(f'RTP {stats.paid / stats.staked:.6f} (exact {exact_rtp:.6f}), return variance {stats.returns.variance:.4f} '
+          f'(exact {np.var(np.array(payouts) / np.array(bets), ddof=1):.4f})')
+
+    # queries while another thread keeps ingesting
+    live = RoundStats(CLASSIC.name, CLASSIC.levels)
+    done = threading.Event()
+    def feed():
+        for bet, paid, level in zip(bets, payouts, cleared):
+            if done.is_set():
+                return
+            live.record(bet, paid, level)
+    feeder = threading.Thread(target=feed)
+    feeder.start()
+    latencies = []
+    for _ in range(20):
+        time.sleep(0.02)
+        start = time.perf_counter()
+        live.report()
+        latencies.append(time.perf_counter() - start)
+    done.set()
+    feeder.join()
+    print(f'report() during ingestion: max {max(latencies) * 1e3:.2f} ms over {len(latencies)} queries, '
+          f'{live.rounds:,} rounds ingested meanwhile')
+
+    per_process = args.rounds // args.processes
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.processes) as pool:
+        snapshots = list(pool.map(ingest, [per_process] * args.processes, range(1, args.processes + 1)))
+    merged = RoundStats.from_snapshot(snapshots[0])
+    for snapshot in snapshots[1:]:
+        merged.merge(RoundStats.from_snapshot(snapshot))
+    print(f'{args.processes} processes merged: {merged.rounds:,} rounds in {time.perf_counter() - start:.2f}s, '
+          f'win p99 {merged.wins.quantile(0.99)}')
+
+if __name__ == '__main__':
+    main()
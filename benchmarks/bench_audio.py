@@ -0,0 +1,52 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+from kivy.clock import Clock
+
+from audio import VoicePool, load_voices
+
+def clicks(count, interval, handler):
+    # a burst of clicks `interval` seconds apart; returns the time spent inside the handler per click.
+    # Each click is followed by the draw pass of its frame, where the pool starts its voice.
+    spent = 0
+    for _ in range(count):
+        start = time.perf_counter()
+        handler()
+        spent += time.perf_counter() - start
+        Clock.tick_draw()
+        time.sleep(interval)
+    return spent / count
+
+def main():
+    parser = argparse.ArgumentParser(description='Click sound: one Sound played in the handler vs a VoicePool triggered off it '
+                                                 '(set SDL_AUDIODRIVER=dummy to run without an audio device)')
+    parser.add_argument('--clicks', type=int, default=200)
+    parser.add_argument('--interval', type=float, default=0.05, help='seconds between clicks')
+    parser.add_argument('--backend', default='kivy', help="'kivy' or 'null'")
+    args = parser.parse_args()
+
+    single = load_voices('button_click.wav', voices=1, backend=args.backend)[0]
+    restarted = 0
+    last = float('-inf')
+    def play_single():
+        nonlocal restarted, last
+        if time.perf_counter() - last < single.length:
+            restarted += 1
+        single.play()
+        last = time.perf_counter()
+    spent = clicks(args.clicks, args.interval, play_single)
+    print(f'single  {spent * 1e6:7.1f} us in handler, {restarted} of {args.clicks} clicks cut the previous one off')
+
+    pool = VoicePool(load_voices('button_click.wav', backend=args.backend))
+    spent = clicks(args.clicks, args.interval, pool.trigger)
+    pool.close()
+    played, steals, p50, p99, worst = pool.stats()
+    print(f'pool    {spent * 1e6:7.1f} us in handler, {steals} of {played} clicks cut one off, '
+          f'trigger to start p50 {p50 * 1e6:.0f} us p99 {p99 * 1e6:.0f} us max {worst * 1e6:.0f} us')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from engine import DEAD_COUNTS, TILES, sample_board, sample_boards
+
+def legacy_board(rng, dead_counts, tiles):
+    # the dict-of-lists layout _start_game used: shuffle the whole row, keep the first few
+    board = {}
+    for i, dead in enumerate(dead_counts):
+        positions = list(range(tiles))
+        rng.shuffle(positions)
+        board[i] = positions[:dead]
+    return board
+
+def legacy_size(board):
+    return sys.getsizeof(board) + sum(sys.getsizeof(row) + sum(sys.getsizeof(p) for p in row) for row in board.values())
+
+def bench(name, dead_counts, tiles, boards):
+    rng = random.Random(0)
+    start = time.perf_counter()
+    legacy = [legacy_board(rng, dead_counts, tiles) for _ in range(boards)]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    packed = [sample_board(rng, dead_counts, tiles) for _ in range(boards)]
+    packed_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = sample_boards(boards, np.random.default_rng(0), dead_counts, tiles) if tiles <= 64 else None
+    batched_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for board in legacy:
+        2 in board[0]
+    legacy_pick = time.perf_counter() - start
+    start = time.perf_counter()
+    for board in packed:
+        board >> 2 & 1
+    packed_pick = time.perf_counter() - start
+
+    print(f'{name} ({len(dead_counts)} levels x {tiles} tiles, {boards:,} boards)')
+    print(f'  sample  legacy {boards / legacy_time:12,.0f}/s  packed {boards / packed_time:12,.0f}/s', end='')
+    print(f'  batched {boards / batched_time:12,.0f}/s' if batched is not None else '')
+    print(f'  pick    legacy {boards / legacy_pick:12,.0f}/s  packed {boards / packed_pick:12,.0f}/s')
+    print(f'  bytes per board: legacy {legacy_size(legacy[0]):,}  packed {sys.getsizeof(packed[0]):,}', end='')
+    print(f'  batched {batched[0].nbytes:,}' if batched is not None else '')
+
+def main():
+    parser = argparse.ArgumentParser(description='Legacy dict-of-lists boards vs packed bitmask boards')
+    parser.add_argument('--boards', type=int, default=100_000)
+    args = parser.parse_args()
+
+    bench('default', DEAD_COUNTS, TILES, args.boards)
+    bench('wide', [3] * 200, 48, args.boards // 100)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import os
+import random
+import time
+import tracemalloc
+
+# headless: the mock GL backend lets Kivy build canvases without a display
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.label import Label
+
+from engine import CLASSIC, compile_variant, is_dead, sample_board
+from main import BoardWidget
+from benchmarks.bench_tiles import RetainedGameTile
+
+class WidgetBoard(BoxLayout):
+    # the board as GameScreen used to build it: a label and a GridLayout of tile Buttons per level
+    def __init__(self, variant, **kwargs):
+        super().__init__(orientation='vertical', spacing=8, **kwargs)
+        self.tiles = []
+        for level in reversed(range(variant.levels)):
+            row = BoxLayout(orientation='horizontal', size_hint_y=None, height=60, spacing=10)
+            row.add_widget(Label(text=f'Level {level + 1}\n{variant.multipliers[level]:.2f}x', size_hint_x=0.15, halign='center', bold=True))
+            grid = GridLayout(cols=variant.tiles, spacing=12, size_hint_x=0.85)
+            tiles = []
+            for _ in range(variant.tiles):
+                tile = RetainedGameTile(disabled=True)
+                grid.add_widget(tile)
+                tiles.append(tile)
+            self.tiles.insert(0, tiles)
+            row.add_widget(grid)
+            self.add_widget(row)
+
+    def layout(self, size):
+        self.size = size
+        self.do_layout()
+        for row in self.children:
+            row.do_layout()
+            row.children[0].do_layout()
+
+    def reveal_all(self, is_dead):
+        for level, tiles in enumerate(self.tiles):
+            for position, tile in enumerate(tiles):
+                if is_dead(level, position):
+                    tile.reveal_dead()
+                else:
+                    tile.reveal_safe()
+                tile.texture_update()
+
+    def reset(self):
+        for tiles in self.tiles:
+            for tile in tiles:
+                tile.reset_tile()
+                tile.texture_update()
+
+class CanvasBoard(BoardWidget):
+    def __init__(self, variant, **kwargs):
+        super().__init__(variant, lambda level, position: None, **kwargs)
+
+    def layout(self, size):
+        self.size = size
+
+    def reveal_all(self, is_dead):
+        super().reveal_all(is_dead)
+        self.redraw()
+
+    def reset(self):
+        super().reset()
+        self.redraw()
+
+def count(widget):
+    widgets, instructions = 0, 0
+    stack = [widget]
+    while stack:
+        widget = stack.pop()
+        widgets += 1
+        for canvas in (widget.canvas.before, widget.canvas, widget.canvas.after):
+            instructions += len(canvas.children)
+        stack.extend(widget.children)
+    return widgets, instructions
+
+def bench(name, board_class, variant, frames):
+    tracemalloc.start()
+    board = board_class(variant)
+    board.layout((360, 536))
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    widgets, instructions = count(board)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        board.layout((360 + frame % 2, 536))
+    layout = (time.perf_counter() - start) / frames
+
+    boards = [sample_board(random.Random(frame), variant.dead_counts, variant.tiles) for frame in range(frames)]
+    start = time.perf_counter()
+    for frame in range(frames):
+        board.reveal_all(lambda level, position: is_dead(boards[frame], level, position, variant.tiles))
+        board.reset()
+    reveal = (time.perf_counter() - start) / frames
+
+    print(f'{name:8s} {widgets:4d} widgets {instructions:5d} instructions {memory / 1024:8.1f} KiB  '
+          f'layout {layout * 1e3:7.3f} ms  full reveal+reset {reveal * 1e3:7.3f} ms')
+
+def main():
+    parser = argparse.ArgumentParser(description='Board of tile widgets vs one single-canvas BoardWidget')
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--tiles', type=int, default=None, help='tiles per level (default: classic board)')
+    args = parser.parse_args()
+
+    variant = CLASSIC
+    if args.tiles:
+        variant = compile_variant('wide', args.tiles, CLASSIC.dead_counts, CLASSIC.multipliers)
+    bench('widgets', WidgetBoard, variant, args.frames)
+    bench('canvas', CanvasBoard, variant, args.frames)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from engine import GameEngine, LEVELS, MAX_BET
+
+def bench_single(rounds, cash_out_level):
+    engine = GameEngine(balance=rounds * MAX_BET, rng=random.Random(0))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        engine.play_round(10, cash_out_level)
+    return rounds / (time.perf_counter() - start)
+
+def bench_batch(rounds, batch_size, cash_out_level):
+    engine = GameEngine(balance=rounds * MAX_BET)
+    rng = np.random.default_rng(0)
+    bets = np.full(batch_size, 10, dtype=np.int64)
+    done = 0
+    start = time.perf_counter()
+    while done < rounds:
+        engine.play_batch(bets, cash_out_level, rng=rng)
+        done += batch_size
+    return done / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description='Rounds per second of the headless engine')
+    parser.add_argument('--rounds', type=int, default=200_000)
+    parser.add_argument('--batch-rounds', type=int, default=5_000_000)
+    parser.add_argument('--batch-size', type=int, default=100_000)
+    parser.add_argument('--cash-out-level', type=int, default=5, choices=range(1, LEVELS + 1))
+    args = parser.parse_args()
+
+    single = bench_single(args.rounds, args.cash_out_level)
+    batch = bench_batch(args.batch_rounds, args.batch_size, args.cash_out_level)
+    print(f'single: {single:,.0f} rounds/s')
+    print(f'batch:  {batch:,.0f} rounds/s (batch size {args.batch_size:,})')
+
+if __name__ == '__main__':
+    main()
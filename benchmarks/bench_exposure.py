@@ -0,0 +1,62 @@
+import argparse
+import random
+import time
+
+from engine import CLASSIC, load_variants
+from exposure import Exposure
+
+def event_stream(variant, events, live, players, rng):
+    # (method, args) for `live` concurrent rounds, each climbing until it busts or cashes out
+    rounds = []
+    stream = []
+    while len(stream) < events:
+        if len(rounds) < live:
+            account, bet = f'p{rng.randrange(players)}', rng.randint(1, 100)
+            rounds.append([account, bet, 0])
+            stream.append(('opened', (account, bet)))
+            continue
+        index = rng.randrange(len(rounds))
+        account, bet, cleared = round_ = rounds[index]
+        if cleared == variant.levels - 1 or rng.random() < 0.35:
+            rounds[index] = rounds[-1]
+            rounds.pop()
+            stream.append(('closed', (account, bet, cleared)))
+        else:
+            round_[2] += 1
+            stream.append(('advanced', (bet, cleared + 1)))
+    return stream
+
+def bench(variant, stream):
+    exposure = Exposure(variant)
+    calls = [(getattr(exposure, method), args) for method, args in stream]
+    start = time.perf_counter()
+    for call, args in calls:
+        call(*args)
+    return len(calls) / (time.perf_counter() - start), exposure
+
+def rescan_cost(variant, live, repeat=20):
+    # what one total costs without the aggregator: a pass over every live round
+    rounds = [(random.randint(1, 100), random.randrange(variant.levels)) for _ in range(live)]
+    payouts, levels = variant.payouts, variant.levels
+    start = time.perf_counter()
+    for _ in range(repeat):
+        sum(payouts[bet * levels + cleared - 1] if cleared else 0 for bet, cleared in rounds)
+    return (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description='Exposure aggregator updates per second')
+    parser.add_argument('--events', type=lambda x: int(float(x)), default=2_000_000)
+    parser.add_argument('--live', type=int, default=10_000, help='concurrent rounds')
+    parser.add_argument('--players', type=int, default=1_000)
+    parser.add_argument('--variant', default='classic')
+    args = parser.parse_args()
+
+    variant = load_variants()[args.variant] if args.variant != CLASSIC.name else CLASSIC
+    stream = event_stream(variant, args.events, args.live, args.players, random.Random(0))
+    rate, exposure = bench(variant, stream)
+    print(f'{len(stream):,} events at {rate:,.0f} events/s ({1e9 / rate:.0f} ns/event)')
+    print(f'end state: {exposure.summary()}')
+    print(f'rescan of {args.live:,} live rounds for one total: {rescan_cost(variant, args.live) * 1e3:.2f} ms')
+
+if __name__ == '__main__':
+    main()
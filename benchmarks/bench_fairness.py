@@ -0,0 +1,53 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from engine import CLASSIC, GameEngine
+from fairness import SeedPool, FairSession, round_record, verify_file
+
+def bench_round_start(rounds):
+    engine = GameEngine(balance=rounds * 10, rng=random.Random(0))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        engine.start_round(1)
+    plain = (time.perf_counter() - start) / rounds
+
+    fair = FairSession(SeedPool())
+    engine = GameEngine(balance=rounds * 10)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        board, nonce = fair.next_board(CLASSIC)
+        engine.start_round(1, board)
+    seeded = (time.perf_counter() - start) / rounds
+    print(f'round start: random {plain * 1e6:.2f} us, provably fair {seeded * 1e6:.2f} us')
+
+def bench_verify(rounds, workers):
+    fair = FairSession(SeedPool())
+    fd, path = tempfile.mkstemp(suffix='.jsonl')
+    with os.fdopen(fd, 'w') as f:
+        for i in range(rounds):
+            if i % 1000 == 0:
+                fair.rotate()
+            board, nonce = fair.next_board(CLASSIC)
+            f.write(round_record(fair, nonce, board, CLASSIC) + '\n')
+
+    start = time.perf_counter()
+    checked, failures = verify_file(path, workers)
+    elapsed = time.perf_counter() - start
+    os.remove(path)
+    print(f'verify: {checked / elapsed:,.0f} rounds/s ({checked:,} rounds, {len(failures)} failed, workers={workers or os.cpu_count()})')
+
+def main():
+    parser = argparse.ArgumentParser(description='Provably-fair round start cost and bulk verification throughput')
+    parser.add_argument('--rounds', type=int, default=100_000)
+    parser.add_argument('--verify-rounds', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    bench_round_start(args.rounds)
+    bench_verify(args.verify_rounds, args.workers)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+# headless: the mock GL backend lets Kivy run its Clock without a display
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+
+from kivy.clock import Clock
+
+from engine import CLASSIC, sample_board
+from main import FrameTimer
+from workers import WorkerPipeline
+
+def background_work(log, boards):
+    # what a busy session asks for each frame: a batch of boards and an fsync'd write
+    rng = random.Random()
+    def job():
+        for _ in range(boards):
+            sample_board(rng, CLASSIC.dead_counts, CLASSIC.tiles)
+        log.write(b'x' * 64)
+        log.flush()
+        os.fsync(log.fileno())
+    return job
+
+def run(seconds, per_frame, pipeline):
+    timer = FrameTimer()
+    with tempfile.TemporaryFile() as log:
+        job = background_work(log, per_frame)
+        def frame(dt):
+            if pipeline is None:
+                job()
+            else:
+                pipeline.submit_serial(job)
+                pipeline.poll()
+        event = Clock.schedule_interval(frame, 0)
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            Clock.tick()
+        event.cancel()
+        timer.stop()
+        if pipeline is not None:
+            pipeline.close()
+    return timer.summary()
+
+def main():
+    parser = argparse.ArgumentParser(description='Frame times with background work inline on the UI thread vs on the worker pipeline')
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--boards', type=int, default=4000, help='boards drawn per frame')
+    args = parser.parse_args()
+
+    print(f'idle      {run(args.seconds, 0, WorkerPipeline())}')
+    print(f'inline    {run(args.seconds, args.boards, None)}')
+    print(f'pipeline  {run(args.seconds, args.boards, WorkerPipeline())}')
+
+if __name__ == '__main__':
+    main()
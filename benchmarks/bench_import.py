@@ -0,0 +1,39 @@
+import argparse
+import subprocess
+import sys
+
+# cold-import budgets (ms) for the headless modules; none of them may pull in Kivy or NumPy
+HEADLESS = {'engine': 40, 'ledger': 40, 'fairness': 60, 'server': 150}
+FORBIDDEN = ('kivy', 'numpy')
+
+def import_profile(module):
+    # -X importtime lines: "import time: self [us] | cumulative | imported package"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-import time of the headless modules (python -X importtime)')
+    parser.add_argument('--repeat', type=int, default=5, help='best of N fresh interpreters')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply the budgets, for slow machines')
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in HEADLESS.items():
+        profiles = [import_profile(module) for _ in range(args.repeat)]
+        best = min(profile[module] for profile in profiles) / 1e3
+        forbidden = sorted({name for name in profiles[0] if name.split('.')[0] in FORBIDDEN})
+        ok = best <= budget * args.scale and not forbidden
+        failed |= not ok
+        print(f'{module:10s} {best:7.1f} ms (budget {budget * args.scale:5.0f} ms) {"ok" if ok else "FAIL"}'
+              + (f'  imports {", ".join(forbidden)}' if forbidden else ''))
+    raise SystemExit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
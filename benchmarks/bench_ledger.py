@@ -0,0 +1,43 @@
+import argparse
+import shutil
+import tempfile
+import threading
+import time
+
+from ledger import Ledger
+
+def bench(threads, settlements, fsync):
+    directory = tempfile.mkdtemp(prefix='ledger-bench-')
+    ledger = Ledger(directory, fsync=fsync)
+
+    def settle(account):
+        for _ in range(settlements):
+            ledger.bet(account, 10)
+            ledger.payout(account, 12, wait=True) # durable before the player sees the result
+
+    workers = [threading.Thread(target=settle, args=(f'player-{i}',)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    ledger.close()
+    shutil.rmtree(directory)
+
+    total = threads * settlements
+    print(f'{threads:4d} writers fsync={fsync}: {total / elapsed:10,.0f} settlements/s '
+          f'{ledger.commits:7,} commits ({2 * total / max(ledger.commits, 1):,.1f} records per fsync)')
+
+def main():
+    parser = argparse.ArgumentParser(description='Ledger settlement throughput with group commit')
+    parser.add_argument('--settlements', type=int, default=2_000, help='per writer')
+    parser.add_argument('--threads', type=lambda x: [int(t) for t in x.split(',')], default=[1, 8, 64])
+    args = parser.parse_args()
+
+    for threads in args.threads:
+        bench(threads, args.settlements, fsync=True)
+    bench(args.threads[-1], args.settlements, fsync=False)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import threading
+import time
+import urllib.request
+
+from metrics import Metrics
+
+def per_event(fn, events):
+    start = time.perf_counter()
+    for i in range(events):
+        fn(i)
+    return (time.perf_counter() - start) / events
+
+def main():
+    parser = argparse.ArgumentParser(description='Cost of a metrics update, and of a scrape while threads keep updating')
+    parser.add_argument('--events', type=int, default=1_000_000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    metrics = Metrics()
+    picks = metrics.counter('picks_total', 'Tiles picked')
+    paid = metrics.counter('paid_total', 'Coins paid')
+    latency = metrics.histogram('pick_to_reveal_seconds', 'Time from a pick until the redraw')
+    inc = metrics.inc
+    observe = metrics.observe
+    baseline = per_event(lambda i: None, args.events)
+    for name, fn in (('inc', lambda i: inc(picks)),
+                     ('inc by amount', lambda i: inc(paid, i)),
+                     ('observe', lambda i: observe(latency, i * 1e-9))):
+        cost = per_event(fn, args.events) - baseline
+        print(f'{name:14s} {cost * 1e9:5.0f} ns/event')
+
+    done = threading.Event()
+    def update():
+        while not done.is_set():
+            for _ in range(1000):
+                inc(picks)
+    threads = [threading.Thread(target=update) for _ in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    server = metrics.serve(0)
+    url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+    latencies = []
+    for _ in range(20):
+        time.sleep(0.02)
+        start = time.perf_counter()
+        with urllib.request.urlopen(url) as response:
+            response.read()
+        latencies.append(time.perf_counter() - start)
+    done.set()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+    print(f'scrape with {args.threads} threads updating: max {max(latencies) * 1e3:.2f} ms over {len(latencies)} scrapes, '
+          f'{metrics.totals()[picks]:,} picks counted')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import os
+import random
+import time
+
+# headless: the mock GL backend lets Kivy build canvases without a display
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+
+import numpy as np
+
+from engine import CLASSIC, GameEngine, GameState, PickResult, MAX_BET
+from main import BoardWidget, MultiBoardWidget
+
+def bench_single(bets, cash_out_level):
+    # the same picks as a parallel round, one board at a time
+    engine = GameEngine(balance=bets * MAX_BET, rng=random.Random(0))
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(bets):
+        engine.start_round(10)
+        while engine.game_state == GameState.ACTIVE:
+            if engine.level > cash_out_level:
+                engine.cash_out()
+                break
+            if engine.pick(rng.randrange(engine.variant.tiles)) == PickResult.DEAD:
+                break
+        engine.reset_round()
+    return bets / (time.perf_counter() - start)
+
+def bench_parallel(bets, boards, cash_out_level):
+    engine = GameEngine(balance=bets * MAX_BET, rng=random.Random(0))
+    rng = np.random.default_rng(1)
+    done = 0
+    start = time.perf_counter()
+    while done < bets:
+        parallel = engine.start_parallel(10, boards)
+        while parallel.game_state == GameState.ACTIVE:
+            if parallel.level > cash_out_level:
+                parallel.cash_out()
+                break
+            parallel.pick(rng.integers(0, engine.variant.tiles, size=boards))
+        done += boards
+    return done / (time.perf_counter() - start)
+
+def bench_view(boards, picks):
+    # redraw cost of one pick across `boards` boards: one BoardWidget each vs one MultiBoardWidget
+    engine = GameEngine(balance=boards * MAX_BET, rng=random.Random(0))
+    singles = [BoardWidget(CLASSIC, lambda level, position: None, size=(360, 536)) for _ in range(boards)]
+    for board in singles:
+        board._layout()
+    start = time.perf_counter()
+    for pick in range(picks):
+        for board in singles:
+            board.reveal(pick % CLASSIC.levels, pick % CLASSIC.tiles, dead=False)
+            board.redraw()
+    single = (time.perf_counter() - start) / picks
+
+    multi = MultiBoardWidget(CLASSIC, lambda position: None, size=(360, 536))
+    multi.show(engine.start_parallel(1, boards))
+    start = time.perf_counter()
+    for pick in range(picks):
+        multi.redraw()
+    return single, (time.perf_counter() - start) / picks
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-bet cost of parallel bets vs one round per bet')
+    parser.add_argument('--bets', type=int, default=100_000)
+    parser.add_argument('--boards', type=int, action='append', default=None, help='boards per parallel bet; repeat to compare')
+    parser.add_argument('--cash-out-level', type=int, default=3)
+    parser.add_argument('--picks', type=int, default=20, help='redraws timed for the view comparison')
+    args = parser.parse_args()
+
+    single = bench_single(args.bets, args.cash_out_level)
+    print(f'single round    {single:12,.0f} bets/s')
+    for boards in args.boards or [10, 100, 1000]:
+        parallel = bench_parallel(args.bets, boards, args.cash_out_level)
+        print(f'{boards:5d} boards    {parallel:12,.0f} bets/s ({parallel / single:.1f}x)')
+    for boards in (10, 100):
+        single_view, multi_view = bench_view(boards, args.picks)
+        print(f'view, {boards:3d} boards: {single_view * 1e3:7.2f} ms/pick as BoardWidgets, '
+              f'{multi_view * 1e3:5.2f} ms/pick as one MultiBoardWidget')
+
+if __name__ == '__main__':
+    main()
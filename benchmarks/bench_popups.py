@@ -0,0 +1,57 @@
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+
+# headless: the mock GL backend lets Kivy build canvases without a display
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+
+from kivy.clock import Clock
+from kivy.metrics import dp
+from kivy.uix.label import Label
+
+from main import CustomPopup, PopupPool
+
+MESSAGES = ['You won\n{} coins!', 'Game Over!\nYou hit a DEAD tile.', 'Balance reset to\n{} coins.']
+
+def legacy_show(message):
+    # what _show_popup did: a fresh popup and label per message, dismissed by a one-off lambda
+    popup = CustomPopup(
+        title='',
+        content=Label(text=message, color=(0.9, 0.9, 1, 1), font_size='16sp', text_size=(dp(250), None), halign='center'),
+        size_hint=(0.7, 0.3)
+    )
+    popup.open()
+    Clock.schedule_once(lambda dt: popup.dismiss(), 1.4)
+    return popup
+
+def soak(show, count):
+    collections = sum(stat['collections'] for stat in gc.get_stats())
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(count):
+        popup = show(MESSAGES[i % 3].format(i % 50))
+        # rapid play: each message is gone before the next one
+        popup.dismiss(animation=False)
+        if i % 10 == 9:
+            Clock.tick()
+    elapsed = (time.perf_counter() - start) / count
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collections = sum(stat['collections'] for stat in gc.get_stats()) - collections
+    return elapsed, peak, collections
+
+def main():
+    parser = argparse.ArgumentParser(description='Fresh popup per message vs the pre-built PopupPool')
+    parser.add_argument('--count', type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, show in (('fresh', legacy_show), ('pooled', PopupPool().show)):
+        elapsed, peak, collections = soak(show, args.count)
+        print(f'{name:7s} {elapsed * 1e6:8.1f} us/message  peak traced {peak / 1024:8.1f} KiB  {collections:4d} GC collections')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import random
+import time
+
+from engine import GameEngine, LEVELS, MAX_BET
+from simulator import simulate
+
+def bench_loop(rounds, cash_out_levels):
+    engine = GameEngine(balance=rounds * len(cash_out_levels) * MAX_BET, rng=random.Random(0))
+    start = time.perf_counter()
+    for level in cash_out_levels:
+        for _ in range(rounds):
+            engine.play_round(10, level)
+    return rounds / (time.perf_counter() - start)
+
+def bench_vectorized(rounds, cash_out_levels):
+    start = time.perf_counter()
+    simulate(rounds, cash_out_levels, seed=0)
+    return rounds / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description='Vectorized simulator vs the shuffle-per-level loop')
+    parser.add_argument('--loop-rounds', type=int, default=50_000)
+    parser.add_argument('--rounds', type=int, default=20_000_000)
+    args = parser.parse_args()
+
+    strategies = list(range(1, LEVELS + 1))
+    loop = bench_loop(args.loop_rounds, strategies)
+    vectorized = bench_vectorized(args.rounds, strategies)
+    print(f'loop:       {loop:,.0f} rounds/s ({len(strategies)} strategies)')
+    print(f'vectorized: {vectorized:,.0f} rounds/s ({len(strategies)} strategies)')
+    print(f'speedup:    {vectorized / loop:,.0f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import tempfile
+import time
+
+# headless: the mock GL backend lets Kivy build canvases without a display
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.uix.screenmanager import ScreenManager
+
+import main as game
+
+class BenchApp(game.SafeOrDeadApp):
+    # keeps the benchmark out of the player's real ledger
+    user_data_dir = tempfile.mkdtemp(prefix='safe_or_dead_bench_')
+
+def eager_build(app):
+    # build() as it was: every screen and the sound ready before the first frame
+    app.ledger = game.Ledger(os.path.join(app.user_data_dir, 'ledger'))
+    app.engine = game.GameEngine(variant=game.load_variants()[game.VARIANT], ledger=app.ledger)
+    app.sound_enabled = True
+    app.click_sound = game.VoicePool(game.load_voices('button_click.wav'))
+    sm = ScreenManager()
+    for name, screen in (('intro', game.IntroScreen), ('main_menu', game.MainMenuScreen), ('instructions', game.InstructionsScreen),
+                         ('credits', game.CreditsScreen), ('game', game.GameScreen)):
+        sm.add_widget(screen(name=name))
+    return sm
+
+def run(build):
+    game.TEXTURES.clear()
+    app = BenchApp()
+    App._running_app = app
+    start = time.perf_counter()
+    build(app)
+    first_frame = time.perf_counter() - start
+
+    frames = 0
+    longest = 0
+    preloader = getattr(app, 'preloader', None)
+    while preloader is not None and preloader._event.is_triggered:
+        tick = time.perf_counter()
+        Clock.tick()
+        longest = max(longest, time.perf_counter() - tick)
+        frames += 1
+    interactive = time.perf_counter() - start
+    app.ledger.close()
+    return first_frame, interactive, frames, longest
+
+def main():
+    parser = argparse.ArgumentParser(description='Work before the first frame: eager screens vs lazy screens and splash preloading')
+    parser.parse_args()
+
+    first_frame, interactive, _, _ = run(eager_build)
+    print(f'eager  first frame after {first_frame * 1e3:7.1f} ms, interactive after {interactive * 1e3:7.1f} ms')
+    first_frame, interactive, frames, longest = run(lambda app: app.build())
+    print(f'lazy   first frame after {first_frame * 1e3:7.1f} ms, interactive after {interactive * 1e3:7.1f} ms '
+          f'({frames} splash frames, longest {longest * 1e3:.1f} ms)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import os
+import time
+
+# headless: the mock GL backend lets Kivy build canvases without a display
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+
+from kivy.metrics import sp
+from kivy.uix.label import Label
+
+from main import TEXTURES, CachedLabel
+from benchmarks.bench_tiles import RetainedGameTile
+
+def per_call(fn, count):
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    return (time.perf_counter() - start) / count
+
+def main():
+    parser = argparse.ArgumentParser(description='Rasterized label text vs textures shared through TEXTURES')
+    parser.add_argument('--count', type=int, default=2000)
+    args = parser.parse_args()
+
+    tile = RetainedGameTile()
+    def markup_reveal(i):
+        # what a tile reveal cost: markup text set, then the label re-rendered
+        if i % 2:
+            tile.reveal_safe()
+        else:
+            tile.reset_tile()
+        tile.texture_update()
+
+    def cached_reveal(i):
+        TEXTURES.get('SAFE' if i % 2 else '?', sp(20 if i % 2 else 26), bold=True)
+
+    messages = ['Game Over!\nYou hit a DEAD tile.', 'Enter a valid bet!', 'Insufficient balance!']
+    def label_popup(i):
+        label = Label(text=messages[i % 3], font_size='16sp', text_size=(250, None), halign='center')
+        label.texture_update()
+
+    def cached_popup(i):
+        CachedLabel(text=messages[i % 3], text_width=250)
+
+    print(f'tile face  rasterized {per_call(markup_reveal, args.count) * 1e6:8.1f} us   shared texture {per_call(cached_reveal, args.count) * 1e6:6.1f} us')
+    print(f'popup text Label      {per_call(label_popup, args.count) * 1e6:8.1f} us   CachedLabel    {per_call(cached_popup, args.count) * 1e6:6.1f} us')
+    print(f'cache: {TEXTURES.hits:,} hits, {TEXTURES.misses:,} misses')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+import argparse
+import os
+import time
+
+# headless: the mock GL backend lets Kivy build canvases without a display
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+
+from kivy.graphics import Color, RoundedRectangle
+from kivy.uix.button import Button
+
+class LegacyGameTile(Button):
+    # GameTile as it was: canvas.before rebuilt on every pos/size event and every reveal
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.background_color = (0, 0, 0, 0)
+        self._tile_state = 'hidden'
+        self.bind(pos=self._update_graphics, size=self._update_graphics)
+        self.reset_tile()
+
+    def reset_tile(self):
+        self.text = '?'
+        self._tile_state = 'hidden'
+        self._update_graphics()
+
+    def reveal_safe(self):
+        self.text = '[color=ffffff]SAFE[/color]'
+        self.markup = True
+        self._tile_state = 'safe'
+        self._update_graphics()
+
+    def _update_graphics(self, *args):
+        self.canvas.before.clear()
+        with self.canvas.before:
+            if self._tile_state == 'safe':
+                Color(0.0, 0.4, 0.0, 1)
+            else:
+                Color(0.4, 0.4, 0.5, 1)
+            RoundedRectangle(pos=self.pos, size=self.size, radius=[8])
+
+class RetainedGameTile(Button):
+    # GameTile before the board moved onto a single canvas: instructions created once, mutated after
+    COLORS = {
+        'hidden': (0.4, 0.4, 0.5, 1),
+        'safe': (0.0, 0.4, 0.0, 1),
+        'dead': (0.4, 0.0, 0.0, 1),
+    }
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.background_color = (0, 0, 0, 0)
+        self._tile_state = 'hidden'
+        with self.canvas.before:
+            self._bg_color = Color(*self.COLORS['hidden'])
+            self._bg_rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[8])
+        self.bind(pos=self._update_rect, size=self._update_rect)
+        self.reset_tile()
+
+    def reset_tile(self):
+        self.text = '?'
+        self.font_size = '26sp'
+        self.color = (1, 0.9, 0.4, 1)
+        self.bold = True
+        self._tile_state = 'hidden'
+        self._bg_color.rgba = self.COLORS['hidden']
+
+    def reveal_safe(self):
+        self.text = '[color=ffffff]SAFE[/color]'
+        self.markup = True
+        self.font_size = '20sp'
+        self._tile_state = 'safe'
+        self._bg_color.rgba = self.COLORS['safe']
+
+    def reveal_dead(self):
+        self.text = '[color=ffffff]DEAD[/color]'
+        self.markup = True
+        self.font_size = '20sp'
+        self._tile_state = 'dead'
+        self._bg_color.rgba = self.COLORS['dead']
+
+    def _update_rect(self, *args):
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
+
+class AllocationCounter:
+    # counts canvas instructions that did not exist at the previous check; seen instructions
+    # are kept alive so a freed one's id cannot be reused by a new allocation
+    def __init__(self, tiles):
+        self.tiles = tiles
+        self.seen = {}
+        self.check()
+
+    def check(self):
+        new = 0
+        for tile in self.tiles:
+            for instruction in tile.canvas.before.children:
+                if id(instruction) not in self.seen:
+                    self.seen[id(instruction)] = instruction
+                    new += 1
+        return new
+
+def layout_pass(tiles, frame, step=lambda: None):
+    # what a layout pass does to every tile: new position and size
+    for i, tile in enumerate(tiles):
+        tile.pos = (i * 10 + frame % 7, frame % 11)
+        step()
+        tile.size = (60 + frame % 3, 60)
+        step()
+
+def reveal_pass(tiles, frame, step=lambda: None):
+    for tile in tiles:
+        tile.reveal_safe()
+        step()
+    for tile in tiles:
+        tile.reset_tile()
+        step()
+
+def per_frame(tiles, frame_pass, frames):
+    start = time.perf_counter()
+    for frame in range(frames):
+        frame_pass(tiles, frame)
+    elapsed = (time.perf_counter() - start) / frames
+
+    # separate, untimed frame that checks after every event so short-lived instructions count too
+    counter = AllocationCounter(tiles)
+    allocations = 0
+    def step():
+        nonlocal allocations
+        allocations += counter.check()
+    frame_pass(tiles, frames, step)
+    return elapsed, allocations
+
+def bench(name, tile_class, frames, count):
+    tiles = [tile_class(disabled=True) for _ in range(count)]
+    layout, layout_allocations = per_frame(tiles, layout_pass, frames)
+    reveal, reveal_allocations = per_frame(tiles, reveal_pass, frames)
+    print(f'{name:8s} layout {layout * 1e3:7.3f} ms/frame, {layout_allocations:4d} instructions allocated/frame')
+    print(f'{"":8s} reveal {reveal * 1e3:7.3f} ms/frame, {reveal_allocations:4d} instructions allocated/frame')
+
+def main():
+    parser = argparse.ArgumentParser(description='GameTile layout/reveal cost, legacy rebuild vs retained instructions')
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--tiles', type=int, default=40)
+    args = parser.parse_args()
+
+    bench('legacy', LegacyGameTile, args.frames, args.tiles)
+    bench('retained', RetainedGameTile, args.frames, args.tiles)
+
+if __name__ == '__main__':
+    main()
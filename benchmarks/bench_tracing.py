@@ -0,0 +1,42 @@
+import argparse
+import os
+import tempfile
+import time
+
+from tracing import Tracer
+
+class Screen:
+    # stands in for a GameScreen callback
+    def _tile_clicked(self, level, position):
+        return level + position
+
+def per_call(screen, calls):
+    method = screen._tile_clicked
+    start = time.perf_counter()
+    for i in range(calls):
+        method(i, 1)
+    return (time.perf_counter() - start) / calls
+
+def main():
+    parser = argparse.ArgumentParser(description='Cost of a traced callback, off and on, and of dumping the trace')
+    parser.add_argument('--calls', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    off = per_call(Screen(), args.calls)
+    tracer = Tracer()
+    tracer.install(Screen, ['_tile_clicked'])
+    on = per_call(Screen(), args.calls)
+    tracer.uninstall()
+    uninstalled = per_call(Screen(), args.calls)
+    print(f'off:         {off * 1e9:6.0f} ns/call (nothing installed)')
+    print(f'on:          {on * 1e9:6.0f} ns/call ({(on - off) * 1e9:.0f} ns of tracing)')
+    print(f'uninstalled: {uninstalled * 1e9:6.0f} ns/call')
+
+    path = os.path.join(tempfile.mkdtemp(), 'trace.json')
+    start = time.perf_counter()
+    tracer.dump(path)
+    print(f'dump of {min(tracer.recorded, tracer.capacity):,} spans: {(time.perf_counter() - start) * 1e3:.0f} ms, '
+          f'{os.path.getsize(path) / 1e6:.1f} MB')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+
+from engine import TILES
+
+def percentile(samples, q):
+    if not samples:
+        return float('nan')
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+async def _connect(host, port, retries=50):
+    for _ in range(retries):
+        try:
+            return await asyncio.open_connection(host, port)
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise ConnectionError(f'Could not connect to {host}:{port}')
+
+async def _request(reader, writer, payload):
+    writer.write(json.dumps(payload).encode() + b'\n')
+    line = await reader.readline()
+    return json.loads(line)
+
+async def player(host, port, deadline, cash_out_level, tiles, latencies, rng):
+    reader, writer = await _connect(host, port)
+    clock = time.perf_counter
+    try:
+        while clock() < deadline:
+            response = await _request(reader, writer, {'op': 'start', 'bet': 1})
+            if not response['ok']:
+                await _request(reader, writer, {'op': 'reset_balance'})
+                continue
+
+            while response['state'] == 'active' and response['level'] <= cash_out_level:
+                start = clock()
+                response = await _request(reader, writer, {'op': 'pick', 'position': rng.randrange(tiles)})
+                latencies['pick'].append(clock() - start)
+            if response['state'] == 'active':
+                start = clock()
+                await _request(reader, writer, {'op': 'cash_out'})
+                latencies['cash_out'].append(clock() - start)
+            await _request(reader, writer, {'op': 'restart'})
+    finally:
+        writer.close()
+
+async def run(host, port, connections, duration, cash_out_level, tiles=TILES):
+    latencies = {'pick': [], 'cash_out': []}
+    deadline = time.perf_counter() + duration
+    rng = random.Random(0)
+    await asyncio.gather(*(
+        player(host, port, deadline, cash_out_level, tiles, latencies, rng) for _ in range(connections)
+    ))
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description='Local load generator for server.py')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--cash-out-level', type=int, default=3)
+    parser.add_argument('--tiles', type=int, default=TILES)
+    parser.add_argument('--spawn', action='store_true', help='start server.py in a subprocess for the run')
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, 'server.py', '--host', args.host, '--port', str(args.port)])
+    try:
+        latencies = asyncio.run(run(args.host, args.port, args.connections, args.duration, args.cash_out_level, args.tiles))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    for op, samples in latencies.items():
+        print(f'{op:9s} n={len(samples):,} ({len(samples) / args.duration:,.0f}/s) '
+              f'p50={percentile(samples, 0.50) * 1e3:.3f} ms p99={percentile(samples, 0.99) * 1e3:.3f} ms')
+
+if __name__ == '__main__':
+    main()
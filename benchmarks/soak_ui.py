@@ -0,0 +1,64 @@
+import argparse
+import os
+import random
+import tempfile
+import tracemalloc
+
+# headless: the mock GL backend lets Kivy build canvases without a display
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+
+from kivy.app import App
+from kivy.clock import Clock
+
+from engine import GameState
+from main import SafeOrDeadApp
+
+class SoakApp(SafeOrDeadApp):
+    # keeps the soak's bets out of the player's real ledger
+    user_data_dir = tempfile.mkdtemp(prefix='safe_or_dead_soak_')
+
+def play_round(screen, rng, cash_out_level):
+    engine = screen.engine
+    screen.bet_input.text = '1'
+    screen._start_game(None)
+    while engine.game_state == GameState.ACTIVE:
+        level = engine.level
+        screen._tile_clicked(level - 1, rng.randrange(engine.variant.tiles))
+        if engine.game_state == GameState.ACTIVE and level >= cash_out_level and rng.random() < 0.5:
+            # impatient player: cash out a SAFE pick while its level completion is still pending
+            screen._cash_out(None)
+            break
+        while engine.game_state == GameState.ACTIVE and engine.level == level:
+            Clock.tick()
+        if engine.game_state == GameState.ACTIVE and engine.level > cash_out_level:
+            screen._cash_out(None)
+    screen._restart_game(None)
+    if engine.balance < 1:
+        screen._reset_balance(None)
+
+def main():
+    parser = argparse.ArgumentParser(description='Thousands of headless GameScreen rounds; pending events and memory should stay flat')
+    parser.add_argument('--rounds', type=int, default=5000)
+    parser.add_argument('--report-every', type=int, default=1000)
+    parser.add_argument('--cash-out-level', type=int, default=3)
+    args = parser.parse_args()
+
+    app = SoakApp()
+    App._running_app = app
+    screen = app.build().get_screen('game')
+    screen.timers.time_scale = 0
+    rng = random.Random(0)
+    tracemalloc.start()
+    try:
+        for played in range(1, args.rounds + 1):
+            play_round(screen, rng, args.cash_out_level)
+            if played % args.report_every == 0:
+                print(f'{played:7,d} rounds  {screen.timers.pending} registry events  '
+                      f'{len(Clock.get_events())} clock events  {tracemalloc.get_traced_memory()[0] / 1024:8.1f} KiB traced')
+    finally:
+        app.ledger.close()
+
+if __name__ == '__main__':
+    main()
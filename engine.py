@@ -0,0 +1,393 @@
+import json
+import os
+import random
+from array import array
+from collections import namedtuple
+from enum import Enum
+
+LEVELS = 8
+TILES = 5
+MULTIPLIERS = [1.23, 2.78, 3.01, 10.55, 26.83, 42.16, 69.69, 89.69]
+DEAD_COUNTS = [1, 1, 2, 2, 2, 3, 3, 4]
+STARTING_BALANCE = 100
+DEFAULT_BET = 10
+MAX_BET = 1000
+VARIANTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'variants.json')
+# NumPy is imported inside the batch functions only: the UI, server and fairness tools
+# import this module for the rules and tables and should not pay for it
+
+class GameState(Enum):
+    INACTIVE = "inactive"
+    ACTIVE = "active"
+    GAME_OVER = "game_over"
+
+class PickResult(Enum):
+    SAFE = "safe"
+    DEAD = "dead"
+    JACKPOT = "jackpot"
+
+# A game variant compiled into read-only tables: survival[i] and reach[i] are the chance of
+# clearing level i and of clearing levels 0..i, payouts[bet * levels + i] is int(bet * multipliers[i])
+Variant = namedtuple('Variant', 'name levels tiles dead_counts multipliers max_bet survival reach payouts')
+
+def compile_variant(name, tiles, dead_counts, multipliers, max_bet=MAX_BET):
+    levels = len(multipliers)
+    if levels == 0 or len(dead_counts) != levels:
+        raise ValueError(f'{name}: multipliers and dead_counts must have one entry per level')
+    if any(not 0 <= dead < tiles for dead in dead_counts):
+        raise ValueError(f'{name}: dead counts must be between 0 and {tiles - 1}')
+
+    survival = tuple((tiles - dead) / tiles for dead in dead_counts)
+    reach = []
+    p = 1.0
+    for s in survival:
+        p *= s
+        reach.append(p)
+    payouts = array('q', (int(bet * m) for bet in range(max_bet + 1) for m in multipliers))
+    return Variant(
+        name, levels, tiles, tuple(dead_counts), tuple(multipliers), max_bet,
+        survival, tuple(reach), memoryview(payouts).toreadonly(),
+    )
+
+def load_variants(path=VARIANTS_PATH):
+    with open(path) as f:
+        config = json.load(f)
+    return {
+        name: compile_variant(
+            name, spec['tiles'], spec['dead_counts'], spec['multipliers'], spec.get('max_bet', MAX_BET)
+        )
+        for name, spec in config.items()
+    }
+
+CLASSIC = compile_variant('classic', TILES, DEAD_COUNTS, MULTIPLIERS)
+
+class GameEngine:
+    # servers keep one engine per session, so keep instances small; share one rng between them.
+    # With a ledger, every payout waits for its group commit, so a win the player is shown
+    # survives a crash; bets are queued without waiting.
+    __slots__ = (
+        'balance', 'rng', 'variant', 'ledger', 'account', 'exposure',
+        'level', 'bet_amount', 'current_winnings', 'game_state', 'board',
+    )
+
+    def __init__(self, balance=STARTING_BALANCE, rng=None, variant=CLASSIC, ledger=None, account='player', exposure=None):
+        # with a ledger, the balance is the one it recovered for account; `balance` only opens new accounts
+        self.ledger = ledger
+        self.account = account
+        self.exposure = exposure # an Exposure shared by every engine the house runs, or None
+        if ledger is not None:
+            recorded = ledger.balance(account)
+            if recorded is None:
+                ledger.reset(account, balance)
+            else:
+                balance = recorded
+        self.balance = balance
+        self.rng = rng if rng is not None else random.Random()
+        self.variant = variant
+        self.level = 1
+        self.bet_amount = DEFAULT_BET
+        self.current_winnings = 0
+        self.game_state = GameState.INACTIVE
+        self.board = None # packed DEAD bits, see sample_board
+
+    def validate_bet(self, bet):
+        if bet > self.balance:
+            return 'Insufficient Balance!'
+        if bet > self.variant.max_bet:
+            return f'Bet Too High!\nMaximum bet is {self.variant.max_bet} coins'
+        if bet <= 0:
+            return 'Invalid Bet!\nMust be greater than 0'
+        return None
+
+    def start_round(self, bet, board=None):
+        # board lets callers supply a pre-derived board, e.g. a provably-fair one
+        error = self.validate_bet(bet)
+        if error is None and self.exposure is not None:
+            error = self.exposure.check(self.account, bet)
+        if error:
+            raise ValueError(error)
+
+        if board is None:
+            board = sample_board(self.rng, self.variant.dead_counts, self.variant.tiles)
+        self.board = board
+        self.balance -= bet
+        if self.ledger is not None:
+            self.ledger.bet(self.account, bet)
+        self.bet_amount = bet
+        self.level = 1
+        self.current_winnings = 0
+        self.game_state = GameState.ACTIVE
+        if self.exposure is not None:
+            self.exposure.opened(self.account, bet)
+
+    def is_dead(self, level, position):
+        return self.board is not None and (self.board >> (level * self.variant.tiles + position)) & 1 == 1
+
+    def complete_level(self):
+        # returns True when the cleared level was the last one and the jackpot was paid
+        variant = self.variant
+        self.current_winnings = variant.payouts[self.bet_amount * variant.levels + self.level - 1]
+        if self.level >= variant.levels:
+            self.balance += self.current_winnings
+            if self.ledger is not None:
+                self.ledger.payout(self.account, self.current_winnings, wait=True)
+            if self.exposure is not None:
+                self.exposure.closed(self.account, self.bet_amount, self.level - 1)
+            self.game_state = GameState.GAME_OVER
+            return True
+
+        if self.exposure is not None:
+            self.exposure.advanced(self.bet_amount, self.level)
+        self.level += 1
+        return False
+
+    def bust(self):
+        if self.exposure is not None and self.game_state == GameState.ACTIVE:
+            self.exposure.closed(self.account, self.bet_amount, self.level - 1)
+        self.game_state = GameState.GAME_OVER
+        self.level = 1
+        self.current_winnings = 0
+
+    def cash_out(self):
+        if self.game_state != GameState.ACTIVE or self.level == 1:
+            raise RuntimeError('Nothing to cash out')
+        self.balance += self.current_winnings
+        if self.ledger is not None:
+            self.ledger.payout(self.account, self.current_winnings, wait=True)
+        if self.exposure is not None:
+            self.exposure.closed(self.account, self.bet_amount, self.level - 1)
+        self.game_state = GameState.GAME_OVER
+        return self.current_winnings
+
+    def pick(self, position):
+        if self.game_state != GameState.ACTIVE:
+            raise RuntimeError('No active round')
+        # is_dead would read a neighbouring level's bits
+        if not 0 <= position < self.variant.tiles:
+            raise ValueError('Invalid position')
+        if self.is_dead(self.level - 1, position):
+            self.bust()
+            return PickResult.DEAD
+        if self.complete_level():
+            return PickResult.JACKPOT
+        return PickResult.SAFE
+
+    def play_round(self, bet, cash_out_level=None, picks=None):
+        # plays a whole round headless and returns the amount credited back
+        if cash_out_level is None:
+            cash_out_level = self.variant.levels
+        self.start_round(bet)
+        for level in range(cash_out_level):
+            position = picks[level] if picks is not None else self.rng.randrange(self.variant.tiles)
+            result = self.pick(position)
+            if result == PickResult.DEAD:
+                return 0
+            if result == PickResult.JACKPOT:
+                return self.current_winnings
+        return self.cash_out()
+
+    def play_batch(self, bets, cash_out_levels, rng=None):
+        import numpy as np
+        bets = np.asarray(bets, dtype=np.int64)
+        if bets.size and (bets.min() <= 0 or bets.max() > self.variant.max_bet):
+            raise ValueError(f'Bets must be between 1 and {self.variant.max_bet} coins')
+        staked = int(bets.sum())
+        if staked > self.balance:
+            raise ValueError('Insufficient Balance!')
+
+        levels_cleared, payouts = resolve_rounds(bets, cash_out_levels, rng, self.variant)
+        paid = int(payouts.sum())
+        self.balance += paid - staked
+        if self.ledger is not None:
+            self.ledger.bet(self.account, staked)
+            self.ledger.payout(self.account, paid, wait=True)
+        return levels_cleared, payouts
+
+    def start_parallel(self, bet, count, boards=None):
+        # one validation, one charge and one batch of boards for `count` bets of `bet`;
+        # boards is an optional (count, levels) array from sample_boards
+        if count < 1:
+            raise ValueError('Invalid Board Count!\nMust be at least 1')
+        error = self.validate_bet(bet)
+        if error is None and bet * count > self.balance:
+            error = 'Insufficient Balance!'
+        if error is None and self.exposure is not None:
+            error = self.exposure.check(self.account, bet, count)
+        if error:
+            raise ValueError(error)
+
+        import numpy as np
+        variant = self.variant
+        if boards is None:
+            boards = sample_boards(count, np.random.default_rng(self.rng.getrandbits(64)), variant.dead_counts, variant.tiles)
+        staked = bet * count
+        self.balance -= staked
+        if self.ledger is not None:
+            self.ledger.bet(self.account, staked)
+        if self.exposure is not None:
+            self.exposure.opened(self.account, bet, count)
+        return ParallelRound(self, bet, boards)
+
+    def reset_round(self):
+        self.game_state = GameState.INACTIVE
+        self.level = 1
+        self.current_winnings = 0
+        self.board = None
+
+    def clear_board(self):
+        self.board = None
+
+    def reset_balance(self):
+        self.balance = STARTING_BALANCE
+        if self.ledger is not None:
+            self.ledger.reset(self.account, STARTING_BALANCE)
+
+class ParallelRound:
+    # K bets on K independent boards played in lockstep, all on the same level. A pick is
+    # resolved for every live board with one array operation, and the survivors are
+    # settled together with a single payout. Boards are (K, levels) row masks as drawn by
+    # sample_boards; picks[k, i] is the position board k picked on level i, -1 before.
+    __slots__ = ('engine', 'bet', 'boards', 'picks', 'live', 'level', 'game_state', 'paid')
+
+    def __init__(self, engine, bet, boards):
+        import numpy as np
+        self.engine = engine
+        self.bet = bet # on every board
+        self.boards = boards
+        self.picks = np.full(boards.shape, -1, dtype=np.int8)
+        self.live = np.ones(len(boards), dtype=bool)
+        self.level = 1
+        self.game_state = GameState.ACTIVE
+        self.paid = 0
+
+    @property
+    def count(self):
+        return len(self.boards)
+
+    @property
+    def live_count(self):
+        return int(self.live.sum())
+
+    @property
+    def current_winnings(self):
+        # what cashing out the live boards pays now
+        return self._payouts(self.level - 1) if self.level > 1 else 0
+
+    def _payouts(self, cleared):
+        variant = self.engine.variant
+        return variant.payouts[self.bet * variant.levels + cleared - 1] * self.live_count
+
+    def pick(self, positions):
+        # positions: one position for every board or one per board; returns the boards lost
+        if self.game_state != GameState.ACTIVE:
+            raise RuntimeError('No active round')
+        import numpy as np
+        positions = np.asarray(positions)
+        if positions.size and (positions.min() < 0 or positions.max() >= self.engine.variant.tiles):
+            raise ValueError('Invalid position')
+        level = self.level - 1
+        rows = self.boards[:, level]
+        positions = np.broadcast_to(positions.astype(rows.dtype), rows.shape)
+        live = self.live
+        self.picks[live, level] = positions[live]
+        dead = live & ((rows >> positions) & 1 == 1)
+        live &= ~dead
+        lost = int(dead.sum())
+        exposure = self.engine.exposure
+        if exposure is not None and lost:
+            exposure.closed(self.engine.account, self.bet, level, lost)
+
+        if not live.any():
+            self.game_state = GameState.GAME_OVER
+        elif self.level >= self.engine.variant.levels:
+            self._settle(self.level)
+        else:
+            if exposure is not None:
+                exposure.advanced(self.bet, self.level, self.live_count)
+            self.level += 1
+        return lost
+
+    def cash_out(self):
+        if self.game_state != GameState.ACTIVE or self.level == 1:
+            raise RuntimeError('Nothing to cash out')
+        return self._settle(self.level - 1)
+
+    def _settle(self, cleared):
+        engine = self.engine
+        self.paid = self._payouts(cleared)
+        engine.balance += self.paid
+        if engine.ledger is not None:
+            engine.ledger.payout(engine.account, self.paid, wait=True)
+        if engine.exposure is not None:
+            # the survivors still sit one level down, whether this is a cash-out or the jackpot
+            cleared = self.level - 1
+            engine.exposure.closed(engine.account, self.bet, cleared, self.live_count)
+        self.game_state = GameState.GAME_OVER
+        return self.paid
+
+def sample_row(rng, tiles, dead):
+    # Floyd's sampling: a uniform set of `dead` positions out of `tiles` in O(dead) draws
+    mask = 0
+    for j in range(tiles - dead, tiles):
+        bit = 1 << rng.randrange(j + 1)
+        if mask & bit:
+            bit = 1 << j
+        mask |= bit
+    return mask
+
+def sample_board(rng, dead_counts=DEAD_COUNTS, tiles=TILES):
+    # one int per board: bit level * tiles + position is set when that tile is DEAD
+    board = 0
+    for dead in reversed(dead_counts):
+        board = (board << tiles) | sample_row(rng, tiles, dead)
+    return board
+
+def is_dead(board, level, position, tiles=TILES):
+    return (board >> (level * tiles + position)) & 1 == 1
+
+def dead_positions(board, level, tiles=TILES):
+    row = (board >> (level * tiles)) & ((1 << tiles) - 1)
+    return [position for position in range(tiles) if row >> position & 1]
+
+def sample_boards(n, rng=None, dead_counts=DEAD_COUNTS, tiles=TILES):
+    # (n, levels) array of row bitmasks in the narrowest unsigned dtype that holds a row,
+    # built with the same O(dead) Floyd's sampling vectorised across boards
+    if tiles > 64:
+        raise ValueError('Batched boards support at most 64 tiles per row')
+    import numpy as np
+    rng = rng if rng is not None else np.random.default_rng()
+    dtype = next(t for t in (np.uint8, np.uint16, np.uint32, np.uint64) if np.iinfo(t).bits >= tiles)
+    boards = np.zeros((n, len(dead_counts)), dtype=dtype)
+    one = dtype(1)
+    for level, dead in enumerate(dead_counts):
+        row = boards[:, level]
+        for j in range(tiles - dead, tiles):
+            bit = one << rng.integers(0, j + 1, size=n).astype(dtype)
+            taken = (row & bit) != 0
+            row |= np.where(taken, one << dtype(j), bit)
+    return boards
+
+def resolve_rounds(bets, cash_out_levels, rng=None, variant=CLASSIC):
+    # cash_out_levels[r] is the number of levels round r clears before cashing out
+    # (variant.levels means playing for the jackpot); returns (levels_cleared, payouts)
+    import numpy as np
+    rng = rng if rng is not None else np.random.default_rng()
+    levels = variant.levels
+    bets = np.asarray(bets, dtype=np.int64)
+    n = bets.shape[0]
+    cash_out_levels = np.broadcast_to(np.asarray(cash_out_levels, dtype=np.int64), (n,))
+    if n and (cash_out_levels.min() < 1 or cash_out_levels.max() > levels):
+        raise ValueError(f'Cash-out level must be between 1 and {levels}')
+
+    # the picked tile's slot in a freshly shuffled row is uniform over the row, and it
+    # is DEAD when that slot is one of the first dead_counts[i], exactly like
+    # sample_board, so the rest of the row never has to be materialised
+    rank_dtype = np.int8 if variant.tiles <= 127 else np.int32
+    ranks = rng.integers(0, variant.tiles, size=(n, levels), dtype=rank_dtype)
+    hit = ranks < np.array(variant.dead_counts, dtype=rank_dtype)
+    first_dead = np.where(hit.any(axis=1), hit.argmax(axis=1), levels)
+    won = first_dead >= cash_out_levels
+    levels_cleared = np.minimum(first_dead, cash_out_levels)
+    payout_table = np.frombuffer(variant.payouts, dtype=np.int64).reshape(variant.max_bet + 1, levels)
+    payouts = np.where(won, payout_table[bets, cash_out_levels - 1], 0)
+    return levels_cleared, payouts
@@ -0,0 +1,74 @@
+class Exposure:
+    # What the house owes across every live round, kept current by the engines themselves:
+    # opened() on start, advanced() on each cleared level and closed() on bust, cash-out or
+    # jackpot, each O(1) from the round's bet and level with no rescan of the rounds.
+    #   liability: sum of what every live round would be paid by cashing out now
+    #   worst_case: sum of every live round's jackpot
+    #   rounds[i], level_liability[i]: live rounds that have cleared i levels and their liability
+    #   players[account]: worst case of that account's live rounds
+    # count lets one call cover several equal bets, e.g. the live boards of a parallel round.
+    # Not locked: share one between engines on a single thread (the server's event loop).
+    def __init__(self, variant, max_liability=None, max_player_liability=None):
+        self.variant = variant
+        self.max_liability = max_liability # limits on worst_case; None for no limit
+        self.max_player_liability = max_player_liability
+        self.liability = 0
+        self.worst_case = 0
+        self.rounds = [0] * (variant.levels + 1)
+        self.level_liability = [0] * (variant.levels + 1)
+        self.players = {}
+        # plain lists: indexing and updating them is several times cheaper than the
+        # variant's memoryview or an array, and every update is a handful of these
+        self._payouts = list(variant.payouts)
+        self._jackpots = self._payouts[variant.levels - 1::variant.levels] # by bet
+        self._levels = variant.levels
+
+    def check(self, account, bet, count=1):
+        # the error a new round of `count` bets would breach, or None (validate_bet style)
+        jackpot = self._jackpots[bet] * count
+        if self.max_liability is not None and self.worst_case + jackpot > self.max_liability:
+            return 'Table Limit Reached!\nTry a smaller bet'
+        if self.max_player_liability is not None and self.players.get(account, 0) + jackpot > self.max_player_liability:
+            return f'Bet Too High!\nPlayer limit is {self.max_player_liability} coins at risk'
+        return None
+
+    def opened(self, account, bet, count=1):
+        jackpot = self._jackpots[bet] * count
+        self.worst_case += jackpot
+        players = self.players
+        players[account] = players.get(account, 0) + jackpot
+        self.rounds[0] += count
+
+    def advanced(self, bet, cleared, count=1):
+        # `count` rounds of `bet` went from cleared - 1 to cleared levels
+        index = bet * self._levels + cleared - 1
+        after = self._payouts[index] * count
+        before = self._payouts[index - 1] * count if cleared > 1 else 0
+        self.liability += after - before
+        rounds = self.rounds
+        rounds[cleared - 1] -= count
+        rounds[cleared] += count
+        level_liability = self.level_liability
+        level_liability[cleared - 1] -= before
+        level_liability[cleared] += after
+
+    def closed(self, account, bet, cleared, count=1):
+        # the rounds are settled (or lost) after clearing `cleared` levels
+        payouts = self._payouts
+        base = bet * self._levels
+        current = payouts[base + cleared - 1] * count if cleared else 0
+        jackpot = self._jackpots[bet] * count
+        self.liability -= current
+        self.worst_case -= jackpot
+        self.rounds[cleared] -= count
+        self.level_liability[cleared] -= current
+        players = self.players
+        remaining = players[account] - jackpot
+        if remaining:
+            players[account] = remaining
+        else:
+            del players[account]
+
+    def summary(self):
+        return (f'{sum(self.rounds):,} live rounds, liability {self.liability:,}, worst case {self.worst_case:,}'
+                f' across {len(self.players):,} players')
@@ -0,0 +1,179 @@
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import queue
+import secrets
+import struct
+import threading
+from functools import lru_cache
+
+from engine import CLASSIC, load_variants, sample_board
+
+SEED_POOL_SIZE = 256
+VERIFY_CHUNK = 20_000 # log lines per worker task
+_WORDS = struct.Struct('<8I') # one SHA-256 digest as eight little-endian u32 draws
+
+def commitment(server_seed):
+    # published before play; revealing server_seed later lets anyone check it was fixed up front
+    return hashlib.sha256(server_seed).hexdigest()
+
+class HmacRandom:
+    # Deterministic randrange() fed by HMAC-SHA256(server_seed, "client_seed:nonce:block"),
+    # so sample_board draws the exact same board wherever it is re-derived
+    __slots__ = ('_key', '_prefix', '_block', '_words')
+
+    def __init__(self, server_seed, client_seed, nonce):
+        self._key = server_seed
+        self._prefix = f'{client_seed}:{nonce}:'.encode()
+        self._block = 0
+        self._words = []
+
+    def randrange(self, n):
+        # rejection sampling keeps every position equally likely
+        limit = (1 << 32) - (1 << 32) % n
+        while True:
+            if not self._words:
+                digest = hmac.digest(self._key, self._prefix + str(self._block).encode(), 'sha256')
+                self._words = list(reversed(_WORDS.unpack(digest)))
+                self._block += 1
+            value = self._words.pop()
+            if value < limit:
+                return value % n
+
+def derive_board(server_seed, client_seed, nonce, variant=CLASSIC):
+    return sample_board(HmacRandom(server_seed, client_seed, nonce), variant.dead_counts, variant.tiles)
+
+class SeedPool:
+    # server seeds and their commitments are drawn ahead of time on a background thread,
+    # so rotating a seed never waits on the OS entropy source or hashing
+    def __init__(self, size=SEED_POOL_SIZE):
+        self._seeds = queue.Queue(maxsize=size)
+        self._thread = threading.Thread(target=self._fill, name='seed-pool', daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        while True:
+            seed = secrets.token_bytes(32)
+            self._seeds.put((seed, commitment(seed)))
+
+    def get(self):
+        try:
+            return self._seeds.get_nowait()
+        except queue.Empty:
+            seed = secrets.token_bytes(32)
+            return seed, commitment(seed)
+
+class FairSession:
+    # One player's seed pair: the server seed stays secret behind its commitment until
+    # rotate() reveals it; every round uses the next nonce
+    __slots__ = ('pool', 'server_seed', 'commitment', 'client_seed', 'nonce')
+
+    def __init__(self, pool, client_seed=None):
+        self.pool = pool
+        self.server_seed, self.commitment = pool.get()
+        self.client_seed = client_seed if client_seed is not None else secrets.token_hex(8)
+        self.nonce = 0
+
+    def next_board(self, variant=CLASSIC):
+        nonce = self.nonce
+        self.nonce += 1
+        return derive_board(self.server_seed, self.client_seed, nonce, variant), nonce
+
+    def rotate(self, client_seed=None):
+        revealed = self.server_seed
+        self.server_seed, self.commitment = self.pool.get()
+        if client_seed is not None:
+            self.client_seed = client_seed
+        self.nonce = 0
+        return revealed
+
+def round_record(session, nonce, board, variant):
+    return json.dumps({
+        'variant': variant.name,
+        'commitment': session.commitment,
+        'server_seed': session.server_seed.hex(),
+        'client_seed': session.client_seed,
+        'nonce': nonce,
+        'board': board,
+    }, separators=(',', ':'))
+
+@lru_cache(maxsize=None)
+def _variants():
+    return load_variants()
+
+def verify_lines(lines):
+    # returns (rounds checked, [(line number, reason), ...]); lines are (number, text) pairs
+    variants = _variants()
+    failures = []
+    for number, line in lines:
+        try:
+            record = json.loads(line)
+            variant = variants[record['variant']]
+            server_seed = bytes.fromhex(record['server_seed'])
+            board = derive_board(server_seed, record['client_seed'], record['nonce'], variant)
+            committed = record['commitment']
+        except (ValueError, KeyError, TypeError) as e:
+            failures.append((number, f'unreadable: {e}'))
+            continue
+        # a seed picked after the fact still derives its board; only the commitment shown
+        # before play pins it down
+        if commitment(server_seed) != committed:
+            failures.append((number, 'commitment mismatch'))
+        elif board != record['board']:
+            failures.append((number, 'board mismatch'))
+    return len(lines), failures
+
+def _chunks(path, size):
+    with open(path) as f:
+        chunk = []
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                chunk.append((number, line))
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+def verify_file(path, workers=None, chunk_size=VERIFY_CHUNK):
+    # imported here so the server, which only derives boards, does not load multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    checked = 0
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for count, bad in executor.map(verify_lines, _chunks(path, chunk_size)):
+            checked += count
+            failures.extend(bad)
+    return checked, failures
+
+def main():
+    parser = argparse.ArgumentParser(description='Provably-fair board derivation and round-log verification')
+    commands = parser.add_subparsers(dest='command', required=True)
+    derive = commands.add_parser('derive', help='re-derive one board')
+    derive.add_argument('--server-seed', required=True, help='hex')
+    derive.add_argument('--client-seed', required=True)
+    derive.add_argument('--nonce', type=int, required=True)
+    derive.add_argument('--variant', default='classic')
+    verify = commands.add_parser('verify', help='re-derive and check every round in a log')
+    verify.add_argument('log')
+    verify.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == 'derive':
+        server_seed = bytes.fromhex(args.server_seed)
+        variant = load_variants()[args.variant]
+        board = derive_board(server_seed, args.client_seed, args.nonce, variant)
+        print(f'commitment: {commitment(server_seed)}')
+        print(f'board: {board}')
+        return
+
+    checked, failures = verify_file(args.log, args.workers)
+    for number, reason in failures[:20]:
+        print(f'line {number}: {reason}')
+    print(f'{checked:,} rounds checked, {len(failures):,} failed')
+    raise SystemExit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
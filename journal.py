@@ -0,0 +1,210 @@
+import argparse
+import os
+import struct
+import time
+from collections import namedtuple
+from enum import Enum
+
+from engine import GameEngine, GameState, load_variants
+
+MAGIC = b'SODJ'
+VERSION = 2 # 2: the level field widened to 16 bits
+JOURNAL_SUFFIX = '.sodj'
+JOURNAL_KEEP = 20 # session journals kept in the app's journal directory
+
+_FILE_HEADER = struct.Struct('<4sBqH') # magic, version, starting balance, variant name length; name follows
+_EVENT = struct.Struct('<BBHqqI') # kind, state after, level after, balance after, argument, ms since previous
+_BOARD = struct.Struct('<H') # board byte length; little-endian board bytes follow START events
+
+_STATES = list(GameState)
+
+class EventKind(Enum):
+    START = 1 # argument: bet; the board drawn for the round follows
+    REJECTED_START = 2 # argument: bet that validate_bet refused
+    PICK = 3 # argument: level * tiles + position
+    LEVEL_COMPLETE = 4
+    BUST = 5
+    CASH_OUT = 6
+    RESTART = 7
+    RESET_BALANCE = 8
+    MENU = 9
+    PARALLEL = 10 # argument: balance change of a parallel bet, its stake (negative) or its payout
+    REJECTED_LIMIT = 11 # argument: bet refused by the house's exposure limits, which replay does not model
+
+Event = namedtuple('Event', 'kind state level balance argument elapsed_ms board')
+Mismatch = namedtuple('Mismatch', 'index kind expected actual')
+ReplayResult = namedtuple('ReplayResult', 'events seconds recorded_seconds mismatch')
+
+class Journal:
+    # Compact binary record of a GameScreen session: every input, the board each round drew,
+    # and the engine's state, level and balance after each step, so replay() can re-run the
+    # session headless and check it lands in the same places. With a pipeline, the record is
+    # packed on the caller's thread and written on the pipeline's serial worker.
+    def __init__(self, path, engine, pipeline=None):
+        self.path = path
+        self.engine = engine
+        self.pipeline = pipeline
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'wb', buffering=0)
+        name = engine.variant.name.encode()
+        self._file.write(_FILE_HEADER.pack(MAGIC, VERSION, engine.balance, len(name)) + name)
+        self._last = time.monotonic()
+
+    def record(self, kind, argument=0, board=None):
+        engine = self.engine
+        now = time.monotonic()
+        elapsed_ms = min(int((now - self._last) * 1e3), 0xFFFFFFFF)
+        self._last = now
+        data = _EVENT.pack(kind.value, _STATES.index(engine.game_state), engine.level, engine.balance, argument, elapsed_ms)
+        if kind == EventKind.START:
+            raw = board.to_bytes((board.bit_length() + 7) // 8, 'little')
+            data += _BOARD.pack(len(raw)) + raw
+        if self.pipeline is not None:
+            self.pipeline.submit_serial(self._file.write, data)
+        else:
+            self._file.write(data)
+
+    def close(self):
+        self._file.close()
+
+def prune(directory, keep=JOURNAL_KEEP):
+    # drop the oldest session journals beyond `keep`
+    names = sorted(name for name in os.listdir(directory) if name.endswith(JOURNAL_SUFFIX))
+    for name in names[:-keep] if keep else names:
+        os.remove(os.path.join(directory, name))
+
+def read_journal(path):
+    # returns (variant name, starting balance, [Event, ...]); a torn tail is ignored
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, balance, name_length = _FILE_HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'Not a version {VERSION} journal: {path}')
+    offset = _FILE_HEADER.size
+    variant = data[offset:offset + name_length].decode()
+    offset += name_length
+
+    events = []
+    while offset + _EVENT.size <= len(data):
+        kind, state, level, balance_after, argument, elapsed_ms = _EVENT.unpack_from(data, offset)
+        offset += _EVENT.size
+        kind = EventKind(kind)
+        board = None
+        if kind == EventKind.START:
+            if offset + _BOARD.size > len(data):
+                break
+            (length,) = _BOARD.unpack_from(data, offset)
+            offset += _BOARD.size
+            if offset + length > len(data):
+                break
+            board = int.from_bytes(data[offset:offset + length], 'little')
+            offset += length
+        events.append(Event(kind, _STATES[state], level, balance_after, argument, elapsed_ms, board))
+    return variant, balance, events
+
+_OUTCOMES = {EventKind.LEVEL_COMPLETE: False, EventKind.BUST: True, EventKind.CASH_OUT: False}
+
+def _apply(engine, event, picked):
+    # the engine calls GameScreen makes for each journaled step. picked is whether the
+    # pick still waiting for its outcome was DEAD (None when there is none); the outcome
+    # logged next must agree with the recorded board. Returns picked for the next event.
+    kind = event.kind
+    if kind == EventKind.PICK:
+        level, position = divmod(event.argument, engine.variant.tiles)
+        if engine.game_state != GameState.ACTIVE or level != engine.level - 1 or picked is not None:
+            raise ValueError(f'Pick on level {level + 1} is not playable now')
+        return engine.is_dead(level, position)
+    if kind in _OUTCOMES:
+        if kind != EventKind.CASH_OUT and picked is None:
+            raise ValueError(f'{kind.name} without a pick')
+        if picked is not None and picked != _OUTCOMES[kind]:
+            raise ValueError(f'{kind.name} after a {"DEAD" if picked else "SAFE"} pick')
+        picked = None
+    if kind == EventKind.START:
+        if picked is not None:
+            raise ValueError('Round started before the last pick was settled')
+        engine.start_round(event.argument, event.board)
+    elif kind == EventKind.REJECTED_START:
+        if engine.validate_bet(event.argument) is None:
+            raise ValueError(f'Bet of {event.argument} is accepted now')
+    elif kind == EventKind.LEVEL_COMPLETE:
+        engine.complete_level()
+    elif kind == EventKind.BUST:
+        engine.bust()
+    elif kind == EventKind.CASH_OUT:
+        engine.cash_out()
+    elif kind == EventKind.RESTART:
+        engine.reset_round()
+    elif kind == EventKind.RESET_BALANCE:
+        engine.reset_balance()
+    elif kind == EventKind.PARALLEL:
+        engine.balance += event.argument
+    elif kind == EventKind.MENU:
+        if engine.game_state != GameState.ACTIVE:
+            engine.clear_board()
+    return picked
+
+def _describe(state, level, balance):
+    return f'{state.value} at level {level} with balance {balance}'
+
+def replay(path, variants=None):
+    # Re-runs a journal through a fresh engine and stops at the first step whose state,
+    # level or balance differs from the recording, or whose pick outcome the board contradicts
+    variant_name, balance, events = read_journal(path)
+    variants = variants if variants is not None else load_variants()
+    engine = GameEngine(balance=balance, variant=variants[variant_name])
+    mismatch = None
+    picked = None
+    start = time.perf_counter()
+    for index, event in enumerate(events):
+        try:
+            picked = _apply(engine, event, picked)
+        except (ValueError, RuntimeError) as e:
+            mismatch = Mismatch(index, event.kind, _describe(event.state, event.level, event.balance), str(e))
+            break
+        if (engine.game_state, engine.level, engine.balance) != (event.state, event.level, event.balance):
+            mismatch = Mismatch(index, event.kind, _describe(event.state, event.level, event.balance),
+                                _describe(engine.game_state, engine.level, engine.balance))
+            break
+    seconds = time.perf_counter() - start
+    recorded = sum(event.elapsed_ms for event in events) / 1e3
+    return ReplayResult(len(events), seconds, recorded, mismatch)
+
+def _journal_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(JOURNAL_SUFFIX):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded SAFE or DEAD sessions headless and check every step')
+    parser.add_argument('paths', nargs='+', help='journal files or directories of them')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print every event of failing journals')
+    args = parser.parse_args()
+
+    variants = load_variants()
+    failed = 0
+    total_events = 0
+    total_seconds = 0
+    for path in _journal_paths(args.paths):
+        result = replay(path, variants)
+        total_events += result.events
+        total_seconds += result.seconds
+        speedup = result.recorded_seconds / result.seconds if result.seconds else float('inf')
+        if result.mismatch is None:
+            print(f'ok   {path}: {result.events:,} events, {speedup:,.0f}x real time')
+            continue
+        failed += 1
+        m = result.mismatch
+        print(f'FAIL {path}: event {m.index} ({m.kind.name}) expected {m.expected}, got {m.actual}')
+        if args.verbose:
+            for index, event in enumerate(read_journal(path)[2][:m.index + 1]):
+                print(f'  {index:6d} {event.kind.name:15s} arg={event.argument} -> {event.state.name} level {event.level} balance {event.balance}')
+    print(f'{total_events:,} events replayed in {total_seconds * 1e3:.1f} ms, {failed} journal(s) failed')
+    raise SystemExit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+import json
+import os
+import struct
+import threading
+import zlib
+from enum import Enum
+
+WAL_NAME = 'wal.log'
+SNAPSHOT_NAME = 'snapshot.bin'
+COMPACT_EVERY = 100_000 # records between automatic snapshots
+
+_HEADER = struct.Struct('<II') # payload length, crc32 of payload
+_ENTRY = struct.Struct('<QBqH') # seq, kind, amount, account length; account bytes follow
+
+class EntryKind(Enum):
+    BET = 1
+    PAYOUT = 2
+    RESET = 3 # balance set to amount
+
+def _frame(payload):
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+def _encode(seq, kind, account, amount):
+    name = account.encode()
+    return _frame(_ENTRY.pack(seq, kind.value, amount, len(name)) + name)
+
+def _read_frames(data):
+    # yields (end offset, payload) for every intact frame, stopping at a torn or corrupt tail
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, crc = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        offset = start + length
+        yield offset, payload
+
+def _apply(balances, kind, account, amount):
+    if kind == EntryKind.BET:
+        balances[account] = balances.get(account, 0) - amount
+    elif kind == EntryKind.PAYOUT:
+        balances[account] = balances.get(account, 0) + amount
+    else:
+        balances[account] = amount
+
+class Ledger:
+    # Append-only, checksummed log of bets and payouts. record() applies an entry to the
+    # in-memory balances at once and queues it; a flusher thread writes everything queued
+    # with one write and one fsync (group commit), then wakes whoever waits on those seqs.
+    def __init__(self, directory, fsync=True, compact_every=COMPACT_EVERY):
+        self.directory = directory
+        self.fsync = fsync
+        self.compact_every = compact_every
+        self.commits = 0 # fsync'd batches, for benchmarks
+        self._balances = {}
+        self._lock = threading.Lock()
+        self._work = threading.Condition(self._lock)
+        self._flushed = threading.Condition(self._lock)
+        self._pending = []
+        self._since_snapshot = 0
+        self._compact_requested = False
+        self._closed = False
+
+        os.makedirs(directory, exist_ok=True)
+        last_seq = self._recover()
+        self._next_seq = last_seq + 1
+        self._durable_seq = last_seq
+        self._wal = open(os.path.join(directory, WAL_NAME), 'ab')
+        self._flusher = threading.Thread(target=self._flush_loop, name='ledger-flusher', daemon=True)
+        self._flusher.start()
+
+    def _recover(self):
+        snapshot_seq = 0
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_NAME)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, 'rb') as f:
+                frames = list(_read_frames(f.read()))
+            if not frames:
+                raise ValueError(f'Corrupt ledger snapshot: {snapshot_path}')
+            snapshot = json.loads(frames[0][1])
+            snapshot_seq = snapshot['seq']
+            self._balances = snapshot['balances']
+
+        last_seq = snapshot_seq
+        good = 0
+        wal_path = os.path.join(self.directory, WAL_NAME)
+        if os.path.exists(wal_path):
+            with open(wal_path, 'rb') as f:
+                data = f.read()
+            for good, payload in _read_frames(data):
+                seq, kind, amount, length = _ENTRY.unpack_from(payload)
+                if seq <= snapshot_seq:
+                    continue
+                account = payload[_ENTRY.size:_ENTRY.size + length].decode()
+                _apply(self._balances, EntryKind(kind), account, amount)
+                last_seq = seq
+            if good < len(data):
+                # drop the torn tail left by a crash mid-write
+                with open(wal_path, 'r+b') as f:
+                    f.truncate(good)
+        return last_seq
+
+    def balance(self, account, default=None):
+        with self._lock:
+            return self._balances.get(account, default)
+
+    def record(self, kind, account, amount, wait=False):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Ledger is closed')
+            seq = self._next_seq
+            self._next_seq += 1
+            _apply(self._balances, kind, account, amount)
+            self._pending.append(_encode(seq, kind, account, amount))
+            self._work.notify()
+            if wait:
+                while self._durable_seq < seq:
+                    self._flushed.wait()
+        return seq
+
+    def bet(self, account, amount, wait=False):
+        return self.record(EntryKind.BET, account, amount, wait)
+
+    def payout(self, account, amount, wait=False):
+        return self.record(EntryKind.PAYOUT, account, amount, wait)
+
+    def reset(self, account, amount, wait=False):
+        return self.record(EntryKind.RESET, account, amount, wait)
+
+    def wait_durable(self, seq=None):
+        with self._lock:
+            seq = self._next_seq - 1 if seq is None else seq
+            while self._durable_seq < seq:
+                self._flushed.wait()
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._compact_requested and not self._closed:
+                    self._work.wait()
+                if not self._pending and not self._compact_requested:
+                    return
+                batch = self._pending
+                self._pending = []
+                last_seq = self._next_seq - 1
+
+            if batch:
+                self._wal.write(b''.join(batch))
+                self._wal.flush()
+                if self.fsync:
+                    os.fsync(self._wal.fileno())
+                with self._lock:
+                    self._durable_seq = last_seq
+                    self.commits += 1
+                    self._since_snapshot += len(batch)
+                    self._flushed.notify_all()
+
+            if self._compact_requested or (self.compact_every and self._since_snapshot >= self.compact_every):
+                self._compact()
+
+    def _compact(self):
+        # Runs on the flusher thread, the only WAL writer. The snapshot covers every seq handed
+        # out so far; entries still queued are written to the fresh WAL and skipped on replay.
+        with self._lock:
+            seq = self._next_seq - 1
+            payload = json.dumps({'seq': seq, 'balances': self._balances}).encode()
+
+        tmp_path = os.path.join(self.directory, SNAPSHOT_NAME + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(_frame(payload))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.directory, SNAPSHOT_NAME))
+        if self.fsync and hasattr(os, 'O_DIRECTORY'):
+            fd = os.open(self.directory, os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        self._wal.truncate(0)
+        self._wal.seek(0)
+
+        with self._lock:
+            self._durable_seq = max(self._durable_seq, seq)
+            self._since_snapshot = 0
+            self._compact_requested = False
+            self._flushed.notify_all()
+
+    def compact(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Ledger is closed')
+            self._compact_requested = True
+            self._work.notify()
+            while self._compact_requested:
+                self._flushed.wait()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._work.notify()
+        self._flusher.join()
+        self._wal.close()
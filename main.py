@@ -1,3 +1,5 @@
+import time
+STARTED = time.perf_counter() # startup timings are measured from here, before Kivy loads
 from kivy.config import Config
 Config.set('graphics', 'width', '390') # default width when tested
 Config.set('graphics', 'height', '700') # default height when tested
@@ -5,23 +7,74 @@ Config.set('graphics', 'resizable', False)
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen, SlideTransition
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.popup import Popup
+from kivy.uix.widget import Widget
 from kivy.uix.scrollview import ScrollView
 from kivy.clock import Clock
-from kivy.metrics import dp
-from kivy.graphics import Color, RoundedRectangle
-from kivy.core.audio import SoundLoader
+from kivy.base import EventLoop
+from kivy.animation import Animation
+from kivy.logger import Logger
+from kivy.metrics import dp, sp
+from kivy.graphics import Color, Mesh, Rectangle, RoundedRectangle
+from kivy.core.text import Label as CoreLabel
+from array import array
+from collections import Counter, OrderedDict, deque
+import math
+import os
 import random
-from enum import Enum
-
-class GameState(Enum):
-    INACTIVE = "inactive"
-    ACTIVE = "active"
-    GAME_OVER = "game_over"
+from analytics import SNAPSHOT_EVERY, RoundStats
+from audio import VoicePool, load_voices
+from autoplay import AutoplayResult, next_bet, parse_strategy, report
+from engine import GameEngine, GameState, DEFAULT_BET, load_variants
+from exposure import Exposure
+from journal import JOURNAL_SUFFIX, EventKind, Journal, prune
+from ledger import Ledger
+from metrics import Metrics
+from tracing import TRACE_PATH, Tracer
+from workers import BoardSupply, WorkerPipeline
+
+VARIANT = os.environ.get('SAFE_OR_DEAD_VARIANT', 'classic')
+AUTOPLAY = os.environ.get('SAFE_OR_DEAD_AUTOPLAY') # strategy spec, e.g. 'fixed:3' or 'ev-greedy'
+AUTOPLAY_TIME_SCALE = float(os.environ.get('SAFE_OR_DEAD_TIME_SCALE', '0.1'))
+MAX_LIABILITY = os.environ.get('SAFE_OR_DEAD_MAX_LIABILITY') # coins of jackpots at risk before new rounds are refused
+AUTOPLAY_REPORT_EVERY = 100 # rounds between autoplay log lines
+FRAME_SAMPLES = 1024 # recent frame times kept by FrameTimer
+SLOW_FRAME = 1 / 60 * 1.5 # a frame this long shows as a stall at 60 fps
+TEXTURE_CACHE_SIZE = 128 # distinct label strings kept rasterized
+PRELOAD_BUDGET = 0.008 # seconds of preloading per frame while the splash shows
+POPUP_POOL_SIZE = 3
+POPUP_SECONDS = 1.4
+PARALLEL_BOARDS = 10 # boards per parallel bet unless the player asks for more
+PARALLEL_MAX_BOARDS = 100
+METRICS_PORT = os.environ.get('SAFE_OR_DEAD_METRICS_PORT') # serve Prometheus /metrics on localhost when set
+
+# always counted; cheap enough for every pick and settlement
+METRICS = Metrics()
+ROUNDS_STARTED = METRICS.counter('safe_or_dead_rounds_started_total', 'Rounds started (one per board of a parallel bet)')
+PICKS = METRICS.counter('safe_or_dead_picks_total', 'Tiles picked')
+CASH_OUTS = METRICS.counter('safe_or_dead_cash_outs_total', 'Rounds cashed out')
+JACKPOTS = METRICS.counter('safe_or_dead_jackpots_total', 'Rounds that cleared every level')
+WAGERED = METRICS.counter('safe_or_dead_coins_wagered_total', 'Coins bet')
+PAID = METRICS.counter('safe_or_dead_coins_paid_total', 'Coins paid on cash-outs and jackpots')
+PICK_TO_REVEAL = METRICS.histogram('safe_or_dead_pick_to_reveal_seconds', 'Time from a tile pick until the board is redrawn')
+DEATHS = [] # [cleared] -> rounds lost on level cleared + 1; see _death_counter
+
+def _death_counter(cleared):
+    while len(DEATHS) <= cleared:
+        DEATHS.append(METRICS.counter('safe_or_dead_deaths_total', 'Rounds lost on a DEAD tile, by level',
+                                      {'level': str(len(DEATHS) + 1)}))
+    return DEATHS[cleared]
+
+def _count_settlement(paid, cleared, levels, count=1):
+    # `count` rounds settled after clearing `cleared` levels; nothing paid means a DEAD tile
+    if paid:
+        METRICS.inc(JACKPOTS if cleared == levels else CASH_OUTS, count)
+        METRICS.inc(PAID, paid * count)
+    else:
+        METRICS.inc(DEATHS[cleared], count)
 
 class RoundedButton(Button):
     def __init__(self, bg_color=(0.2, 0.6, 0.9, 1), **kwargs):
@@ -30,13 +83,14 @@ class RoundedButton(Button):
         super().__init__(**kwargs)
         self.background_color = (0, 0, 0, 0)
         self.bg_color = bg_color
+        with self.canvas.before:
+            self._bg_color = Color(*bg_color)
+            self._bg_rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[15])
         self.bind(pos=self._update_graphics, size=self._update_graphics)
 
     def _update_graphics(self, *args):
-        self.canvas.before.clear()
-        with self.canvas.before:
-            Color(*self.bg_color)
-            RoundedRectangle(pos=self.pos, size=self.size, radius=[15])
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
 
 class CustomPopup(Popup):
     def __init__(self, **kwargs):
@@ -56,56 +110,492 @@ class CustomPopup(Popup):
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
 
-class GameTile(Button):
-    def __init__(self, **kwargs):
+class TextureCache:
+    # Label textures keyed by text and style. Tile faces, level labels and popup messages are
+    # rasterized once and the texture is shared by everything that shows the same string.
+    def __init__(self, maxsize=TEXTURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._textures = OrderedDict()
+
+    def get(self, text, font_size, **options):
+        key = (text, font_size, tuple(sorted(options.items())))
+        texture = self._textures.get(key)
+        if texture is not None:
+            self.hits += 1
+            self._textures.move_to_end(key)
+            return texture
+
+        self.misses += 1
+        label = CoreLabel(text=text, font_size=font_size, **options)
+        label.refresh()
+        self._textures[key] = texture = label.texture
+        if len(self._textures) > self.maxsize:
+            self._textures.popitem(last=False)
+        return texture
+
+    def clear(self):
+        self._textures.clear()
+
+TEXTURES = TextureCache()
+
+class CachedLabel(Widget):
+    # A centered, single-style label drawn from TEXTURES; changing the text swaps a texture
+    # reference and only rasterizes strings the cache has not seen
+    def __init__(self, text='', font_size=16, color=(1, 1, 1, 1), halign='center', text_width=None, **kwargs):
         super().__init__(**kwargs)
-        self.background_color = (0, 0, 0, 0)
-        self._is_revealed = False
-        self._tile_state = 'hidden' # 'hidden', 'safe', 'dead'
-        self.bind(pos=self._update_graphics, size=self._update_graphics)
-        self.reset_tile()
-
-    def reset_tile(self):
-        self.text = '?'
-        self.font_size = '26sp'
-        self.color = (1, 0.9, 0.4, 1) # golden yellow
-        self.bold = True
-        self._is_revealed = False
-        self._tile_state = 'hidden'
-        self._update_graphics()
-
-    def reveal_safe(self):
-        self.text = '[color=ffffff]SAFE[/color]'
-        self.markup = True
-        self.font_size = '20sp'
-        self._is_revealed = True
-        self._tile_state = 'safe'
-        self._update_graphics()
-
-    def reveal_dead(self):
-        self.text = '[color=ffffff]DEAD[/color]'
-        self.markup = True
-        self.font_size = '20sp'
-        self._is_revealed = True
-        self._tile_state = 'dead'
-        self._update_graphics()
+        self.style = {'font_size': sp(font_size), 'color': tuple(color), 'halign': halign, 'text_size': (text_width, None)}
+        with self.canvas:
+            self._rect = Rectangle()
+        self.bind(pos=self._center, size=self._center)
+        self.set_text(text)
+
+    def set_text(self, text, color=None):
+        if color is not None:
+            self.style['color'] = tuple(color)
+        self.text = text
+        self._rect.texture = TEXTURES.get(text, **self.style) if text else None
+        self._center()
+
+    def _center(self, *args):
+        texture = self._rect.texture
+        w, h = texture.size if texture else (0, 0)
+        self._rect.size = (w, h)
+        self._rect.pos = (self.center_x - w / 2, self.center_y - h / 2)
+
+class FrameTimer:
+    # Time between Clock frames over a recent window, to show whether anything stalls the UI
+    def __init__(self, samples=FRAME_SAMPLES):
+        self.frames = deque(maxlen=samples)
+        self.slow = 0
+        self._last = None
+        self._event = Clock.schedule_interval(self._tick, 0)
+
+    def _tick(self, dt):
+        now = time.perf_counter()
+        if self._last is not None:
+            frame = now - self._last
+            self.frames.append(frame)
+            if frame > SLOW_FRAME:
+                self.slow += 1
+        self._last = now
+
+    def summary(self):
+        frames = sorted(self.frames)
+        if not frames:
+            return 'no frames'
+        return (f'{len(frames)} frames, p50 {frames[len(frames) // 2] * 1e3:.1f} ms '
+                f'p99 {frames[min(len(frames) - 1, int(len(frames) * 0.99))] * 1e3:.1f} ms '
+                f'max {frames[-1] * 1e3:.1f} ms, {self.slow} over {SLOW_FRAME * 1e3:.0f} ms')
+
+    def stop(self):
+        self._event.cancel()
+
+class TimerRegistry:
+    # Every timed GameScreen transition is scheduled here. schedule() returns a handle for
+    # cancel(); fired events drop out on their own. cancel_all() ends whatever a round still
+    # has pending in O(1): it bumps the generation, and events scheduled under an older one
+    # fire as no-ops instead of being unscheduled one by one. time_scale compresses every
+    # delay (0 fires on the next frame).
+    def __init__(self, time_scale=1.0):
+        self.time_scale = time_scale
+        self._events = {}
+        self._next_handle = 0
+        self._generation = 0
+
+    def schedule(self, callback, timeout):
+        handle = self._next_handle
+        self._next_handle += 1
+        generation = self._generation
+        def fire(dt):
+            if generation != self._generation:
+                return
+            del self._events[handle]
+            callback()
+        self._events[handle] = Clock.schedule_once(fire, timeout * self.time_scale)
+        return handle
+
+    def cancel(self, handle):
+        event = self._events.pop(handle, None)
+        if event is not None:
+            event.cancel()
+
+    def cancel_all(self):
+        self._generation += 1
+        self._events = {}
+
+    @property
+    def pending(self):
+        return len(self._events)
+
+class PopupPool:
+    # A few pre-built CustomPopups re-targeted with new text and reused. Each owns a dismiss
+    # trigger that is cancelled and re-armed on reuse, so showing a message allocates nothing.
+    def __init__(self, size=POPUP_POOL_SIZE):
+        self._popups = []
+        self._shown = [] # open and not yet dismissing, oldest first
+        for _ in range(size):
+            popup = CustomPopup(title='', content=CachedLabel(text_width=dp(250)))
+            popup.dismiss_timer = Clock.create_trigger(popup.dismiss, POPUP_SECONDS)
+            popup.bind(on_dismiss=self._dismissed)
+            self._popups.append(popup)
+
+    def _acquire(self):
+        for popup in self._popups:
+            if popup.parent is None:
+                return popup
+        if self._shown:
+            # all on screen: re-target the oldest one
+            return self._shown[0]
+        # all fading out: cut one short
+        popup = self._popups[0]
+        Animation.cancel_all(popup)
+        popup.dismiss(animation=False)
+        return popup
+
+    def show(self, message, color=(0.9, 0.9, 1, 1), size_hint=(0.7, 0.3), duration=POPUP_SECONDS):
+        popup = self._acquire()
+        if popup in self._shown:
+            self._shown.remove(popup)
+        self._shown.append(popup)
+        popup.content.set_text(message, color)
+        popup.size_hint = size_hint
+        popup.open()
+        popup.dismiss_timer.cancel()
+        popup.dismiss_timer.timeout = duration
+        popup.dismiss_timer()
+        return popup
+
+    def _dismissed(self, popup):
+        popup.dismiss_timer.cancel()
+        if popup in self._shown:
+            self._shown.remove(popup)
+
+    def dismiss_all(self):
+        for popup in self._shown[:]:
+            popup.dismiss()
 
-    def _update_graphics(self, *args):
-        self.canvas.before.clear()
-        with self.canvas.before:
-            if self._tile_state == 'safe':
-                Color(0.0, 0.4, 0.0, 1) # green
-            elif self._tile_state == 'dead':
-                Color(0.4, 0.0, 0.0, 1) # red
-            else:
-                Color(0.4, 0.4, 0.5, 1) # blue-gray
-            RoundedRectangle(pos=self.pos, size=self.size, radius=[8])
+def _rounded_rect(x, y, w, h, radius, segments):
+    # triangle fan: center, then each corner arc counter-clockwise from the top right
+    radius = min(radius, w / 2, h / 2)
+    vertices = [x + w / 2, y + h / 2, 0, 0]
+    corners = ((x + w - radius, y + h - radius), (x + radius, y + h - radius), (x + radius, y + radius), (x + w - radius, y + radius))
+    for corner, (cx, cy) in enumerate(corners):
+        for step in range(segments + 1):
+            angle = math.pi / 2 * (corner + step / segments)
+            vertices.extend((cx + radius * math.cos(angle), cy + radius * math.sin(angle), 0, 0))
+    return vertices
+
+class BoardWidget(Widget):
+    # The whole board on one canvas: a Mesh per tile color and a textured Mesh per face,
+    # whatever the grid size. Touches are mapped to (level, position) here, and any number
+    # of state changes in a frame are drawn by one rebuild of those meshes.
+    COLORS = {
+        'hidden': (0.4, 0.4, 0.5, 1), # blue-gray
+        'safe': (0.0, 0.4, 0.0, 1), # green
+        'dead': (0.4, 0.0, 0.0, 1), # red
+    }
+    FACES = {
+        'active': ('?', 26, (1, 0.9, 0.4, 1)), # golden yellow, sp
+        'waiting': ('?', 26, (1, 1, 1, 0.3)), # dimmed like a disabled button
+        'safe': ('SAFE', 20, (1, 1, 1, 1)),
+        'dead': ('DEAD', 20, (1, 1, 1, 1)),
+    }
+    ROW_HEIGHT = dp(60)
+    ROW_SPACING = 8
+    TILE_SPACING = 12
+    LABEL_SPACING = 10
+    LABEL_WIDTH = 0.15
+    RADIUS = 8
+    CORNER_SEGMENTS = 4
+
+    def __init__(self, variant, on_pick, **kwargs):
+        super().__init__(**kwargs)
+        self.levels = variant.levels
+        self.tiles = variant.tiles
+        self.on_pick = on_pick
+        self.states = [['hidden'] * variant.tiles for _ in range(variant.levels)]
+        self.active_level = None
+        self._revealed_at = None # first reveal not yet drawn, for PICK_TO_REVEAL
+        self._tile_shapes = [] # [level][position] -> background vertices
+        self._tile_boxes = [] # [level][position] -> (x, y, w, h)
+        self._grid = None # (left, top, tile width, row height)
+
+        perimeter = 4 * (self.CORNER_SEGMENTS + 1)
+        self._fan = [i for edge in range(1, perimeter + 1) for i in (0, edge, edge % perimeter + 1)]
+        with self.canvas:
+            Color(1, 0.8, 0.2, 1)
+            self._labels = [
+                Rectangle(texture=TEXTURES.get(
+                    f'Level {level + 1}\n{variant.multipliers[level]:.2f}x', sp(16), bold=True, halign='center'
+                )) for level in range(variant.levels)
+            ]
+            self._backgrounds = {}
+            for state, rgba in self.COLORS.items():
+                Color(*rgba)
+                self._backgrounds[state] = Mesh(mode='triangles')
+            self._faces = {}
+            for face, (text, font_size, rgba) in self.FACES.items():
+                Color(*rgba)
+                self._faces[face] = Mesh(mode='triangles', texture=TEXTURES.get(text, sp(font_size), bold=True))
+
+        self._redraw_trigger = Clock.create_trigger(self.redraw)
+        self.bind(pos=self._layout, size=self._layout)
+
+    def _layout(self, *args):
+        row_height = min(self.ROW_HEIGHT, (self.height - self.ROW_SPACING * (self.levels - 1)) / self.levels)
+        label_width = (self.width - self.LABEL_SPACING) * self.LABEL_WIDTH
+        left = self.x + label_width + self.LABEL_SPACING
+        tile_width = (self.right - left - self.TILE_SPACING * (self.tiles - 1)) / self.tiles
+        self._grid = (left, self.top, tile_width, row_height)
+
+        self._tile_boxes = []
+        self._tile_shapes = []
+        for level in range(self.levels):
+            y = self.top - (self.levels - level) * row_height - (self.levels - 1 - level) * self.ROW_SPACING
+            boxes = [(left + position * (tile_width + self.TILE_SPACING), y, tile_width, row_height) for position in range(self.tiles)]
+            self._tile_boxes.append(boxes)
+            self._tile_shapes.append([_rounded_rect(*box, self.RADIUS, self.CORNER_SEGMENTS) for box in boxes])
+
+            label = self._labels[level]
+            w, h = label.texture.size
+            label.size = (w, h)
+            label.pos = (self.x + (label_width - w) / 2, y + (row_height - h) / 2)
+        self.redraw()
+
+    def redraw(self, *args):
+        if self._grid is None:
+            return
+        backgrounds = {state: ([], []) for state in self.COLORS}
+        faces = {face: ([], []) for face in self.FACES}
+        for level, row in enumerate(self.states):
+            for position, state in enumerate(row):
+                if state == 'hidden':
+                    face = 'active' if level == self.active_level else 'waiting'
+                else:
+                    face = state
+
+                vertices, indices = backgrounds[state]
+                offset = len(vertices) // 4
+                vertices.extend(self._tile_shapes[level][position])
+                indices.extend(offset + i for i in self._fan)
+
+                vertices, indices = faces[face]
+                offset = len(vertices) // 4
+                x, y, w, h = self._tile_boxes[level][position]
+                texture = self._faces[face].texture
+                tw, th = texture.size
+                x, y = x + (w - tw) / 2, y + (h - th) / 2
+                u = texture.tex_coords
+                vertices.extend((x, y, u[0], u[1], x + tw, y, u[2], u[3], x + tw, y + th, u[4], u[5], x, y + th, u[6], u[7]))
+                indices.extend((offset, offset + 1, offset + 2, offset + 2, offset + 3, offset))
+
+        for meshes, data in ((self._backgrounds, backgrounds), (self._faces, faces)):
+            for key, (vertices, indices) in data.items():
+                meshes[key].vertices = vertices
+                meshes[key].indices = indices
+        if self._revealed_at is not None:
+            METRICS.observe(PICK_TO_REVEAL, time.perf_counter() - self._revealed_at)
+            self._revealed_at = None
+
+    def tile_at(self, x, y):
+        if self._grid is None:
+            return None
+        left, top, tile_width, row_height = self._grid
+        position, dx = divmod(x - left, tile_width + self.TILE_SPACING)
+        row, dy = divmod(top - y, row_height + self.ROW_SPACING)
+        if not (0 <= position < self.tiles and 0 <= row < self.levels) or dx > tile_width or dy > row_height:
+            return None
+        return self.levels - 1 - int(row), int(position)
+
+    def on_touch_down(self, touch):
+        if self.disabled or not self.collide_point(*touch.pos):
+            return super().on_touch_down(touch)
+        tile = self.tile_at(*touch.pos)
+        if tile is not None and tile[0] == self.active_level and self.states[tile[0]][tile[1]] == 'hidden':
+            self.on_pick(*tile)
+        return True
+
+    def set_active_level(self, level):
+        if level != self.active_level:
+            self.active_level = level
+            self._redraw_trigger()
+
+    def reveal(self, level, position, dead):
+        if self._revealed_at is None:
+            self._revealed_at = time.perf_counter()
+        self.states[level][position] = 'dead' if dead else 'safe'
+        self._redraw_trigger()
+
+    def reveal_all(self, is_dead):
+        self.active_level = None
+        for level, row in enumerate(self.states):
+            for position in range(self.tiles):
+                row[position] = 'dead' if is_dead(level, position) else 'safe'
+        self._redraw_trigger()
+
+    def reset(self):
+        self.active_level = None
+        for row in self.states:
+            row[:] = ['hidden'] * self.tiles
+        self._redraw_trigger()
+
+class MultiBoardWidget(Widget):
+    # Every board of a ParallelRound as a small grid of plain quads on one canvas, with a
+    # Mesh per tile color, so a pick across K boards is one vectorised rebuild whatever K is.
+    # Touching the active row of any board picks that position on all the live ones.
+    STATES = ('hidden', 'active', 'safe', 'dead', 'lost')
+    COLORS = dict(BoardWidget.COLORS, active=(0.6, 0.55, 0.3, 1), lost=(0.2, 0.2, 0.25, 1))
+    BOARD_SPACING = 8
+    TILE_SPACING = 2
+
+    def __init__(self, variant, on_pick, **kwargs):
+        super().__init__(**kwargs)
+        self.levels = variant.levels
+        self.tiles = variant.tiles
+        self.on_pick = on_pick
+        self.round = None
+        self._quads = None # [board, level, position] -> 16 vertex floats
+        self._indices = None # [quad] -> its two triangles
+        self._grid = None # (columns, board width, board height, tile width, row height)
+        with self.canvas:
+            self._meshes = []
+            for state in self.STATES:
+                Color(*self.COLORS[state])
+                self._meshes.append(Mesh(mode='triangles'))
+        self._redraw_trigger = Clock.create_trigger(self.redraw)
+        self.bind(pos=self._layout, size=self._layout)
+
+    def show(self, parallel_round):
+        self.round = parallel_round
+        self._layout()
+
+    def _layout(self, *args):
+        if self.round is None:
+            return
+        import numpy as np
+        count = self.round.count
+        # the column count that gives the largest tiles
+        best = None
+        for columns in range(1, count + 1):
+            rows = -(-count // columns)
+            board_width = (self.width - self.BOARD_SPACING * (columns - 1)) / columns
+            board_height = (self.height - self.BOARD_SPACING * (rows - 1)) / rows
+            tile = min(board_width / self.tiles, board_height / self.levels)
+            if best is None or tile > best[0]:
+                best = (tile, columns, board_width, board_height)
+        _, columns, board_width, board_height = best
+        tile_width, row_height = board_width / self.tiles, board_height / self.levels
+        self._grid = (columns, board_width, board_height, tile_width, row_height)
+
+        board = np.arange(count)[:, None, None]
+        level = np.arange(self.levels)[None, :, None]
+        position = np.arange(self.tiles)[None, None, :]
+        x0 = self.x + board % columns * (board_width + self.BOARD_SPACING) + position * tile_width
+        y0 = self.top - (board // columns + 1) * board_height - board // columns * self.BOARD_SPACING + level * row_height
+        x0, y0 = np.broadcast_arrays(x0, y0)
+        x1, y1 = x0 + tile_width - self.TILE_SPACING, y0 + row_height - self.TILE_SPACING
+        zero = np.zeros_like(x0)
+        self._quads = np.stack((x0, y0, zero, zero, x1, y0, zero, zero, x1, y1, zero, zero, x0, y1, zero, zero),
+                               axis=-1).astype(np.float32)
+        self._indices = (np.arange(self._quads[..., 0].size)[:, None] * 4 + (0, 1, 2, 2, 3, 0)).astype(np.uint16)
+        self.redraw()
+
+    def _states(self):
+        # index into STATES for every [board, level, position]
+        import numpy as np
+        r = self.round
+        hidden, active, safe, dead, lost = range(len(self.STATES))
+        shifts = np.arange(self.tiles, dtype=r.boards.dtype)
+        is_dead = (r.boards[:, :, None] >> shifts) & 1 == 1
+        if r.game_state != GameState.ACTIVE:
+            # everything revealed; boards that paid nothing keep their safe tiles grayed
+            states = np.where(is_dead, dead, safe)
+            states[~r.live[:, None, None] & ~is_dead] = lost
+            return states
+        states = np.full(is_dead.shape, hidden)
+        states[~r.live] = lost
+        states[r.live, r.level - 1] = active
+        picked = r.picks[:, :, None] == np.arange(self.tiles)
+        states[picked] = np.where(is_dead[picked], dead, safe)
+        return states
+
+    def redraw(self, *args):
+        if self._quads is None:
+            return
+        states = self._states()
+        for state, mesh in enumerate(self._meshes):
+            # handed over as typed arrays: copying the bytes is far cheaper than building float lists
+            quads = self._quads[states == state]
+            vertices, indices = array('f'), array('H')
+            vertices.frombytes(quads.tobytes())
+            indices.frombytes(self._indices[:len(quads)].tobytes())
+            mesh.vertices = vertices
+            mesh.indices = indices
+
+    def refresh(self):
+        self._redraw_trigger()
+
+    def tile_at(self, x, y):
+        # (level, position) under the touch, on whichever board it lands
+        if self._grid is None:
+            return None
+        columns, board_width, board_height, tile_width, row_height = self._grid
+        column, dx = divmod(x - self.x, board_width + self.BOARD_SPACING)
+        row, dy = divmod(self.top - y, board_height + self.BOARD_SPACING)
+        if column >= columns or row * columns + column >= self.round.count or dx > board_width or dy > board_height:
+            return None
+        return self.levels - 1 - int(dy // row_height), min(int(dx // tile_width), self.tiles - 1)
+
+    def on_touch_down(self, touch):
+        if self.disabled or not self.collide_point(*touch.pos):
+            return super().on_touch_down(touch)
+        tile = self.tile_at(*touch.pos)
+        r = self.round
+        if tile is not None and r.game_state == GameState.ACTIVE and tile[0] == r.level - 1:
+            self.on_pick(tile[1])
+        return True
+
+class LazyScreenManager(ScreenManager):
+    # screens are registered as factories and built the first time they are needed
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.factories = {}
+
+    def register(self, name, factory):
+        self.factories[name] = factory
+
+    def get_screen(self, name):
+        factory = self.factories.pop(name, None)
+        if factory is not None:
+            self.add_widget(factory(name=name))
+        return super().get_screen(name)
+
+    def has_screen(self, name):
+        return name in self.factories or super().has_screen(name)
+
+class Preloader:
+    # Drains an iterator of small loading steps across frames, spending at most `budget`
+    # seconds per frame so the splash keeps animating, then calls on_done
+    def __init__(self, steps, on_done, budget=PRELOAD_BUDGET):
+        self.budget = budget
+        self.on_done = on_done
+        self._steps = iter(steps)
+        self._event = Clock.schedule_interval(self._run, 0)
+
+    def _run(self, dt):
+        deadline = time.perf_counter() + self.budget
+        for _ in self._steps:
+            if time.perf_counter() >= deadline:
+                return
+        self._event.cancel()
+        self.on_done()
 
 class IntroScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._setup_ui()
-        Clock.schedule_once(lambda dt: setattr(self.manager, 'current', 'main_menu'), 3)
 
     def _setup_ui(self):
         layout = BoxLayout(orientation='vertical')
@@ -146,6 +636,7 @@ class MainMenuScreen(Screen):
         ))
         buttons = [
             ('Play Game', (0.2, 0.8, 0.3, 1), lambda x: setattr(self.manager, 'current', 'game')),
+            ('Parallel Bets', (0.2, 0.6, 0.6, 1), lambda x: setattr(self.manager, 'current', 'parallel')),
             ('Instructions', (0.3, 0.6, 0.9, 1), lambda x: setattr(self.manager, 'current', 'instructions')),
             ('Credits', (0.9, 0.5, 0.2, 1), lambda x: setattr(self.manager, 'current', 'credits')),
             ('Exit', (0.8, 0.2, 0.2, 1), lambda x: App.get_running_app().stop())
@@ -209,7 +700,7 @@ class InstructionsScreen(Screen):
 
         scroll = ScrollView()
         instructions = Label(
-            text='Choose "SAFE" tiles to progress and win coins!\n\nAvoid "DEAD" tiles or lose everything.\n\nEach level has different numbers of "DEAD" tiles and multipliers.\nThe higher you go, the more you can win!\n\nYou can cash out at any time to secure your winnings.\n\nReach level 8 to hit the JACKPOT!',
+            text=f'Choose "SAFE" tiles to progress and win coins!\n\nAvoid "DEAD" tiles or lose everything.\n\nEach level has different numbers of "DEAD" tiles and multipliers.\nThe higher you go, the more you can win!\n\nYou can cash out at any time to secure your winnings.\n\nReach level {App.get_running_app().engine.variant.levels} to hit the JACKPOT!',
             text_size=(None, None),
             halign='center',
             valign='top',
@@ -283,27 +774,36 @@ class CreditsScreen(Screen):
         self.bg_rect.size = self.size
 
 class GameScreen(Screen):
-    def __init__(self, **kwargs):
+    def __init__(self, staged=False, **kwargs):
         super().__init__(**kwargs)
-        self.level = 1
-        self.bet_amount = 10
-        self.current_winnings = 0
-        self.game_state = GameState.INACTIVE
-        self.game_tiles = []
-        self.all_dead_positions = {}
-        self.MULTIPLIERS = [1.23, 2.78, 3.01, 10.55, 26.83, 42.16, 69.69, 89.69]
-        self.DEAD_COUNTS = [1, 1, 2, 2, 2, 3, 3, 4]
-        self._setup_ui()
-
-    def _set_level_state(self, active_level=None, enable_all=False):
-        for i, level_tiles in enumerate(self.game_tiles):
-            should_enable = enable_all or (active_level is not None and i == active_level and self.game_state == GameState.ACTIVE)
-            for tile in level_tiles:
-                tile.disabled = not should_enable
+        self.engine = App.get_running_app().engine
+        self.journal = getattr(App.get_running_app(), 'journal', None)
+        self.boards = getattr(App.get_running_app(), 'boards', None)
+        self.timers = TimerRegistry()
+        # staged: the caller drives setup_steps, e.g. a Preloader spreading it over frames
+        self.setup_steps = self._setup_ui()
+        if not staged:
+            for _ in self.setup_steps:
+                pass
+
+    def _set_level_state(self, active_level=None):
+        self.board.set_active_level(active_level if self.engine.game_state == GameState.ACTIVE else None)
+
+    def _record(self, kind, argument=0, board=None):
+        if self.journal is not None:
+            self.journal.record(kind, argument, board)
+
+    def _record_settlement(self, paid, cleared):
+        _count_settlement(paid, cleared, self.engine.variant.levels)
+        app = App.get_running_app()
+        if getattr(app, 'analytics', None) is not None:
+            app.record_round(self.engine.bet_amount, paid, cleared)
 
     def _go_to_menu(self, instance):
-        if self.game_state != GameState.ACTIVE:
+        # a bust still being revealed finishes in the background
+        if self.engine.game_state != GameState.ACTIVE and not self.timers.pending:
             self._cleanup_resources()
+        self._record(EventKind.MENU)
         self.manager.current = 'main_menu'
 
     def _setup_ui(self):
@@ -348,28 +848,9 @@ class GameScreen(Screen):
         self.start_btn.bind(on_press=self._start_game)
         bet_layout.add_widget(self.bet_input)
         bet_layout.add_widget(self.start_btn)
-        self.levels_layout = BoxLayout(orientation='vertical', spacing=8, size_hint_y=0.6)
-
-        for display_idx in range(8):
-            actual_level = 7 - display_idx
-            level_container = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(60), spacing=10)
-            multiplier_label = Label(
-                text=f'Level {actual_level + 1}\n{self.MULTIPLIERS[actual_level]:.2f}x',
-                size_hint_x=0.15, font_size='16sp', color=(1, 0.8, 0.2, 1), halign='center', bold=True
-            )
-
-            level_grid = GridLayout(cols=5, spacing=12, size_hint_x=0.85)
-            level_tiles = []
-            for j in range(5):
-                tile = GameTile(disabled=True)
-                tile.bind(on_press=lambda x, level=actual_level, pos=j: self._tile_clicked(level, pos))
-                level_grid.add_widget(tile)
-                level_tiles.append(tile)
-
-            self.game_tiles.insert(0, level_tiles)
-            level_container.add_widget(multiplier_label)
-            level_container.add_widget(level_grid)
-            self.levels_layout.add_widget(level_container)
+        yield
+        self.board = BoardWidget(self.engine.variant, self._tile_clicked, size_hint_y=0.6)
+        yield
 
         button_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50), spacing=15)
         button_layout.pos_hint = {'center_x': 0.5}
@@ -427,14 +908,17 @@ class GameScreen(Screen):
 
         main_layout.add_widget(info_layout)
         main_layout.add_widget(bet_layout)
-        main_layout.add_widget(self.levels_layout)
+        main_layout.add_widget(self.board)
         main_layout.add_widget(button_layout)
         self.add_widget(main_layout)
+        yield
+        self.popups = PopupPool()
+        yield
 
     def _validate_bet_input(self, instance, text):
         try:
-            if text and int(text) > 1000:
-                instance.text = '1000'
+            if text and int(text) > self.engine.variant.max_bet:
+                instance.text = str(self.engine.variant.max_bet)
         except ValueError:
             pass
 
@@ -449,112 +933,80 @@ class GameScreen(Screen):
             if hasattr(self, '_original_button_layout') and self._original_button_layout not in main_layout.children:
                 main_layout.add_widget(self._original_button_layout)
 
-        if self.game_state == GameState.ACTIVE:
+        if self.engine.game_state == GameState.ACTIVE:
             self._update_display()
             self._update_button_states()
-            self._set_level_state(active_level=self.level - 1)
+            self._set_level_state(active_level=self.engine.level - 1)
             return
 
-        app = App.get_running_app()
         try:
-            bet = int(self.bet_input.text) if self.bet_input.text else 10
-            if bet > app.balance:
-                return self._show_popup('Insufficient Balance!')
-            if bet > 1000:
-                return self._show_popup('Bet Too High!\nMaximum bet is 1000 coins')
-            if bet <= 0:
-                return self._show_popup('Invalid Bet!\nMust be greater than 0')
+            bet = int(self.bet_input.text) if self.bet_input.text else DEFAULT_BET
         except ValueError:
             return self._show_popup('Enter a valid bet!')
-
-        self.all_dead_positions = {}
-        for i in range(8):
-            dead_count = self.DEAD_COUNTS[i]
-            positions = list(range(5))
-            random.shuffle(positions)
-            self.all_dead_positions[i] = positions[:dead_count]
-
-        app.balance -= bet
-        self.bet_amount = bet
-        self.level = 1
-        self.current_winnings = 0
-        self.game_state = GameState.ACTIVE
+        error = self.engine.validate_bet(bet)
+        if error:
+            self._record(EventKind.REJECTED_START, bet)
+            return self._show_popup(error)
+        error = self.engine.exposure.check(self.engine.account, bet) if self.engine.exposure is not None else None
+        if error:
+            self._record(EventKind.REJECTED_LIMIT, bet)
+            return self._show_popup(error)
+
+        self.engine.start_round(bet, self.boards.take() if self.boards is not None else None)
+        METRICS.inc(ROUNDS_STARTED)
+        METRICS.inc(WAGERED, bet)
+        self._record(EventKind.START, bet, self.engine.board)
         self._reset_all_tiles()
         self._setup_level()
         self._update_display()
         self._update_button_states()
 
     def _reset_all_tiles(self):
-        for level_tiles in self.game_tiles:
-            for tile in level_tiles:
-                tile.reset_tile()
-                tile.disabled = True
+        self.board.reset()
 
         if hasattr(self, 'game_over_layout') and self.game_over_layout.parent:
             self.game_over_layout.parent.remove_widget(self.game_over_layout)
 
     def _setup_level(self):
-        if self.level > 8:
-            return self._win_game()
-
-        if not hasattr(self, 'all_dead_positions') or not self.all_dead_positions:
+        if self.engine.board is None:
             return
 
-        self.dead_positions = self.all_dead_positions[self.level - 1]
-        self._set_level_state(active_level=self.level - 1)
-        self.cash_out_btn.disabled = self.level == 1
+        self._set_level_state(active_level=self.engine.level - 1)
+        self.cash_out_btn.disabled = self.engine.level == 1
 
     def _tile_clicked(self, level, position):
-        if self.game_state != GameState.ACTIVE or level != (self.level - 1):
+        if self.engine.game_state != GameState.ACTIVE or level != (self.engine.level - 1):
             return
 
-        tile = self.game_tiles[level][position]
-        for t in self.game_tiles[level]:
-            t.disabled = True
+        self.board.set_active_level(None)
+        self._record(EventKind.PICK, level * self.engine.variant.tiles + position)
+        METRICS.inc(PICKS)
 
         app = App.get_running_app()
-        if hasattr(app, 'sound_enabled') and app.sound_enabled and hasattr(app, 'button_sound') and app.button_sound:
-            app.button_sound.play()
-
-        if position in self.dead_positions:
-            tile.reveal_dead()
-            Clock.schedule_once(lambda dt: self._show_death_popup(), 0.2)
+        if app.sound_enabled and app.click_sound is not None:
+            app.click_sound.trigger()
+
+        if self.engine.is_dead(level, position):
+            # the bust settles now and only its animation waits, so Cash Out or Menu in
+            # the meantime cannot undo it
+            self._record_settlement(0, level)
+            self.engine.bust()
+            self._record(EventKind.BUST)
+            self.cash_out_btn.disabled = True
+            self.board.reveal(level, position, dead=True)
+            self.timers.schedule(self._show_death_popup, 0.2)
 
         else:
-            tile.reveal_safe()
-            Clock.schedule_once(lambda dt: self._level_complete(), 0.04)
+            self.board.reveal(level, position, dead=False)
+            self.timers.schedule(self._level_complete, 0.04)
 
     def _show_death_popup(self):
-        popup = CustomPopup(
-            title='',
-            content=Label(
-                text='Game Over!\nYou hit a DEAD tile.',
-                color=(1, 0.9, 0.9, 1),
-                font_size='16sp',
-                text_size=(dp(250), None),
-                halign='center'
-            ),
-            size_hint=(0.5, 0.2)
-        )
-        popup.open()
-        Clock.schedule_once(lambda dt: popup.dismiss(), 1.4)
-        Clock.schedule_once(lambda dt: self._reveal_all_and_end_game(), 1.6)
+        self.popups.show('Game Over!\nYou hit a DEAD tile.', color=(1, 0.9, 0.9, 1), size_hint=(0.5, 0.2))
+        self.timers.schedule(self._reveal_all_and_end_game, 1.6)
 
     def _reveal_all_and_end_game(self):
-        for level_idx, level_tiles in enumerate(self.game_tiles):
-            level_dead_positions = self.all_dead_positions.get(level_idx, [])
-            for pos, tile in enumerate(level_tiles):
-                if pos in level_dead_positions:
-                    tile.reveal_dead()
-                else:
-                    tile.reveal_safe()
-                tile.disabled = True
-
+        self.board.reveal_all(self.engine.is_dead)
         self._show_game_over_buttons()
-        self.game_state = GameState.GAME_OVER
-        self.level = 1
-        self.current_winnings = 0
-        self.cash_out_btn.disabled = True
         self._update_display()
         self._update_button_states()
 
@@ -571,71 +1023,65 @@ class GameScreen(Screen):
                             return
 
     def _level_complete(self):
-        self.current_winnings = int(self.bet_amount * self.MULTIPLIERS[self.level - 1])
-        if self.level >= 8:
+        jackpot = self.engine.complete_level()
+        self._record(EventKind.LEVEL_COMPLETE)
+        if jackpot:
             return self._win_game()
 
-        self.level += 1
         self.cash_out_btn.disabled = False
         self._setup_level()
         self._update_display()
 
     def _cash_out(self, instance):
-        app = App.get_running_app()
-        app.balance += self.current_winnings
-        self._show_popup(f'You won\n{self.current_winnings} coins!')
+        if self.engine.game_state != GameState.ACTIVE:
+            return
+        # a level completion still in flight belongs to the round being cashed out
+        self.timers.cancel_all()
+        winnings = self.engine.cash_out()
+        self._record(EventKind.CASH_OUT)
+        self._record_settlement(winnings, self.engine.level - 1)
+        self._show_popup(f'You won\n{winnings} coins!')
         self._reset_all_tiles()
         self._show_game_over_buttons()
-        self.game_state = GameState.GAME_OVER
 
     def _win_game(self):
-        app = App.get_running_app()
-        winnings = int(self.bet_amount * self.MULTIPLIERS[7])
-        app.balance += winnings
-        self._show_popup(f'JACKPOT!\nYou won {winnings} coins!')
+        self._record_settlement(self.engine.current_winnings, self.engine.level)
+        self._show_popup(f'JACKPOT!\nYou won {self.engine.current_winnings} coins!')
         self._show_game_over_buttons()
-        self.game_state = GameState.GAME_OVER
         self._update_display()
 
     def _reset_game_state(self):
-        self.game_state = GameState.INACTIVE
-        self.level = 1
-        self.current_winnings = 0
+        self.engine.reset_round()
         self.cash_out_btn.disabled = True
 
     def _update_button_states(self):
-        if self.game_state == GameState.ACTIVE:
+        if self.engine.game_state == GameState.ACTIVE:
             self.start_btn.disabled = True
             self.reset_btn.disabled = True
             self.bet_input.disabled = True
 
-        elif self.game_state == GameState.GAME_OVER:
+        elif self.engine.game_state == GameState.GAME_OVER:
             self.start_btn.disabled = True
             self.reset_btn.disabled = False
             self.bet_input.disabled = True
 
-        elif self.game_state == GameState.INACTIVE:
+        elif self.engine.game_state == GameState.INACTIVE:
             self.start_btn.disabled = False
             self.reset_btn.disabled = False
             self.bet_input.disabled = False
 
     def _cleanup_resources(self):
-        Clock.unschedule(self._show_death_popup)
-        Clock.unschedule(self._level_complete)
-        Clock.unschedule(self._reveal_all_and_end_game)
-        Clock.unschedule(self._dismiss_popup)
-        for level_tiles in self.game_tiles:
-            for tile in level_tiles:
-                tile.unbind(on_press=tile.dispatch)
+        self.timers.cancel_all()
+        self.popups.dismiss_all()
 
-        if hasattr(self, 'all_dead_positions') and self.game_state != GameState.ACTIVE:
-            self.all_dead_positions.clear()
+        if self.engine.game_state != GameState.ACTIVE:
+            self.engine.clear_board()
 
     def _restart_game(self, instance):
+        self.timers.cancel_all()
         self._reset_game_state()
+        self._record(EventKind.RESTART)
         self._update_button_states()
-        if hasattr(self, 'all_dead_positions'):
-            delattr(self, 'all_dead_positions')
 
         main_layout = self.children[0]
         if self.game_over_layout in main_layout.children:
@@ -648,52 +1094,351 @@ class GameScreen(Screen):
         self._update_display()
 
     def _reset_balance(self, instance):
-        App.get_running_app().balance = 100
+        self.engine.reset_balance()
+        self._record(EventKind.RESET_BALANCE)
         self._update_display()
-        self._show_popup('Balance reset to\n100 coins.')
+        self._show_popup(f'Balance reset to\n{self.engine.balance} coins.')
 
     def _update_display(self):
-        app = App.get_running_app()
-        self.balance_label.text = f'Balance: {app.balance} coins'
-        self.winnings_label.text = f'Winnings: {self.current_winnings} coins'
+        self.balance_label.text = f'Balance: {self.engine.balance} coins'
+        self.winnings_label.text = f'Winnings: {self.engine.current_winnings} coins'
 
     def _show_popup(self, message):
-        popup = CustomPopup(
-            title='',
-            content=Label(
-                text=message,
-                color=(0.9, 0.9, 1, 1),
-                font_size='16sp',
-                text_size=(dp(250), None),
-                halign='center'
-            ),
-            size_hint=(0.7, 0.3)
-        )
-        popup.open()
-        Clock.schedule_once(lambda dt: self._dismiss_popup(popup), 1.4)
-
-    def _dismiss_popup(self, popup):
-        if popup:
-            popup.dismiss()
-            popup = None
+        self.popups.show(message)
 
     def on_enter(self):
         self._update_display()
         self._update_button_states()
 
+class ParallelScreen(Screen):
+    # One bet placed on many boards at once (engine.start_parallel): each tap picks the same
+    # position on every live board and Cash Out settles all the survivors together
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = App.get_running_app().engine
+        self.journal = getattr(App.get_running_app(), 'journal', None)
+        self.round = None
+        self._setup_ui()
+
+    def _setup_ui(self):
+        with self.canvas.before:
+            Color(0.05, 0.05, 0.1, 1)
+            self.bg_rect = RoundedRectangle(size=self.size, pos=self.pos, radius=[0])
+        self.bind(size=self._update_bg, pos=self._update_bg)
+        main_layout = BoxLayout(orientation='vertical', padding=15, spacing=15)
+        info_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(40))
+        self.balance_label = Label(font_size='18sp', color=(1, 0.8, 0.2, 1), bold=True)
+        self.winnings_label = Label(font_size='18sp', color=(0.2, 0.8, 0.3, 1), bold=True)
+        info_layout.add_widget(self.balance_label)
+        info_layout.add_widget(self.winnings_label)
+
+        bet_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50), spacing=10)
+        bet_layout.add_widget(Label(text='Bet:', font_size='18sp', size_hint_x=None, width=dp(40), color=(0.9, 0.9, 0.9, 1)))
+        self.bet_input = TextInput(text=str(DEFAULT_BET), multiline=False, input_filter='int', size_hint_x=None,
+                                   width=dp(55), font_size='18sp', halign='center')
+        bet_layout.add_widget(self.bet_input)
+        bet_layout.add_widget(Label(text='x', font_size='18sp', size_hint_x=None, width=dp(15), color=(0.9, 0.9, 0.9, 1)))
+        self.count_input = TextInput(text=str(PARALLEL_BOARDS), multiline=False, input_filter='int', size_hint_x=None,
+                                     width=dp(55), font_size='18sp', halign='center')
+        self.count_input.bind(text=self._validate_count_input)
+        bet_layout.add_widget(self.count_input)
+        self.start_btn = RoundedButton(text='Start', font_size='16sp', color=(1, 1, 1, 1), bg_color=(0.2, 0.8, 0.3, 1))
+        self.start_btn.bind(on_press=self._start_round)
+        bet_layout.add_widget(self.start_btn)
+
+        self.board = MultiBoardWidget(self.engine.variant, self._tile_picked, size_hint_y=0.6)
+        self.status_label = Label(font_size='16sp', size_hint_y=None, height=dp(30), color=(0.9, 0.9, 0.9, 1))
+
+        button_layout = BoxLayout(orientation='horizontal', size_hint=(None, None), size=(dp(255), dp(50)), spacing=15)
+        button_layout.pos_hint = {'center_x': 0.5}
+        self.cash_out_btn = RoundedButton(text='Cash Out', disabled=True, font_size='16sp', color=(1, 1, 1, 1), bg_color=(0.9, 0.6, 0.1, 1))
+        self.cash_out_btn.bind(on_press=self._cash_out)
+        back_btn = RoundedButton(text='Menu', font_size='16sp', color=(1, 1, 1, 1), bg_color=(0.6, 0.3, 0.8, 1))
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'main_menu'))
+        button_layout.add_widget(self.cash_out_btn)
+        button_layout.add_widget(back_btn)
+
+        main_layout.add_widget(info_layout)
+        main_layout.add_widget(bet_layout)
+        main_layout.add_widget(self.board)
+        main_layout.add_widget(self.status_label)
+        main_layout.add_widget(button_layout)
+        self.add_widget(main_layout)
+        self.popups = PopupPool()
+
+    def _validate_count_input(self, instance, text):
+        try:
+            if text and int(text) > PARALLEL_MAX_BOARDS:
+                instance.text = str(PARALLEL_MAX_BOARDS)
+        except ValueError:
+            pass
+
+    def _update_bg(self, *args):
+        self.bg_rect.pos = self.pos
+        self.bg_rect.size = self.size
+
+    def _record(self, amount):
+        # the journal only replays single rounds; a parallel one is recorded as its balance changes
+        if self.journal is not None:
+            self.journal.record(EventKind.PARALLEL, amount)
+
+    def _active(self):
+        return self.round is not None and self.round.game_state == GameState.ACTIVE
+
+    def _start_round(self, instance):
+        if self._active():
+            return
+        try:
+            bet = int(self.bet_input.text) if self.bet_input.text else DEFAULT_BET
+            count = int(self.count_input.text) if self.count_input.text else PARALLEL_BOARDS
+        except ValueError:
+            return self.popups.show('Enter a valid bet!')
+        try:
+            self.round = self.engine.start_parallel(bet, count)
+        except ValueError as e:
+            return self.popups.show(str(e))
+        self._record(-bet * count)
+        METRICS.inc(ROUNDS_STARTED, count)
+        METRICS.inc(WAGERED, bet * count)
+        self.board.show(self.round)
+        self._update_display()
+
+    def _tile_picked(self, position):
+        if not self._active():
+            return
+        app = App.get_running_app()
+        if app.sound_enabled and app.click_sound is not None:
+            app.click_sound.trigger()
+
+        lost = self.round.pick(position)
+        METRICS.inc(PICKS)
+        self.board.refresh()
+        if self.round.game_state != GameState.ACTIVE:
+            self._settled(jackpot=True)
+        elif lost:
+            self.popups.show(f'{lost} board{"s" if lost > 1 else ""} hit DEAD', color=(1, 0.9, 0.9, 1), size_hint=(0.5, 0.2))
+        self._update_display()
+
+    def _cash_out(self, instance):
+        if self._active() and self.round.level > 1:
+            self.round.cash_out()
+            self.board.refresh()
+            self._settled(jackpot=False)
+            self._update_display()
+
+    def _settled(self, jackpot):
+        paid = self.round.paid
+        self._record(paid)
+        r = self.round
+        levels = self.engine.variant.levels
+        # per board: the survivors share the payout, a lost board cleared one level fewer than it picked
+        settled = Counter(((r.picks[~r.live] >= 0).sum(axis=1) - 1).tolist())
+        settled = [(0, cleared, count) for cleared, count in settled.items()]
+        if r.live_count:
+            settled.append((paid // r.live_count, r.level if jackpot else r.level - 1, r.live_count))
+        app = App.get_running_app()
+        for board_paid, cleared, count in settled:
+            _count_settlement(board_paid, cleared, levels, count)
+            if getattr(app, 'analytics', None) is not None:
+                app.record_round(r.bet, board_paid, cleared, count)
+        if paid == 0:
+            self.popups.show('Game Over!\nEvery board hit DEAD.', color=(1, 0.9, 0.9, 1), size_hint=(0.5, 0.2))
+        elif jackpot:
+            self.popups.show(f'JACKPOT on {self.round.live_count} boards!\nYou won {paid} coins!')
+        else:
+            self.popups.show(f'You won\n{paid} coins\non {self.round.live_count} boards!')
+
+    def _update_display(self):
+        active = self._active()
+        self.balance_label.text = f'Balance: {self.engine.balance} coins'
+        r = self.round
+        if r is None:
+            self.winnings_label.text = 'Winnings: 0 coins'
+            self.status_label.text = 'Place one bet on every board'
+        else:
+            winnings = r.current_winnings if active else r.paid
+            self.winnings_label.text = f'Winnings: {winnings} coins'
+            self.status_label.text = f'{r.live_count} of {r.count} boards alive, level {r.level}'
+        self.start_btn.disabled = active
+        self.bet_input.disabled = active
+        self.count_input.disabled = active
+        self.cash_out_btn.disabled = not active or r.level == 1
+
+    def on_enter(self):
+        self._update_display()
+
+    def on_leave(self):
+        self.popups.dismiss_all()
+
+class Autoplayer:
+    # Plays GameScreen through its own handlers (_start_game, _tile_clicked, _cash_out,
+    # _restart_game), one step per frame once the previous transition has fired, with the
+    # screen's delays compressed by time_scale
+    def __init__(self, screen, strategy, rounds=None, time_scale=AUTOPLAY_TIME_SCALE, rng=None):
+        self.screen = screen
+        self.strategy = strategy
+        self.rounds = rounds
+        self.rng = rng if rng is not None else random.Random()
+        self.balances = array('q')
+        self.played = 0
+        self.resets = 0
+        self.started = time.perf_counter()
+        screen.timers.time_scale = time_scale
+        self._event = Clock.schedule_interval(self._step, 0)
+
+    def _step(self, dt):
+        screen = self.screen
+        engine = screen.engine
+        if screen.timers.pending:
+            return
+
+        if engine.game_state == GameState.INACTIVE:
+            if self.rounds is not None and self.played >= self.rounds:
+                return self.stop()
+            bet = next_bet(engine, self.strategy)
+            if bet < 1:
+                self.resets += 1
+                return screen._reset_balance(None)
+            screen.bet_input.text = str(bet)
+            screen._start_game(None)
+
+        elif engine.game_state == GameState.ACTIVE:
+            if engine.level > 1 and self.strategy.cash_out(engine):
+                screen._cash_out(None)
+            else:
+                screen._tile_clicked(engine.level - 1, self.strategy.pick(engine, self.rng))
+
+        else:
+            # busting zeroes the winnings; a cash-out or the jackpot keeps them
+            self.strategy.settle(engine.current_winnings > 0)
+            screen._restart_game(None)
+            self.played += 1
+            self.balances.append(engine.balance)
+            if self.played % AUTOPLAY_REPORT_EVERY == 0:
+                Logger.info(f'Autoplay: {report(self.strategy, self.result())}')
+
+    def result(self):
+        return AutoplayResult(self.played, time.perf_counter() - self.started, self.balances, self.resets)
+
+    def stop(self):
+        self._event.cancel()
+        self.screen.timers.time_scale = 1.0
+        Logger.info(f'Autoplay: {report(self.strategy, self.result())}')
+
+# what SAFE_OR_DEAD_TRACE times, besides whole frames and the Clock's callbacks
+TRACED = {
+    GameScreen: ('_start_game', '_tile_clicked', '_show_death_popup', '_reveal_all_and_end_game', '_show_game_over_buttons',
+                 '_level_complete', '_cash_out', '_win_game', '_restart_game', '_reset_balance', '_update_display'),
+    BoardWidget: ('redraw',),
+    PopupPool: ('show',),
+}
+
 class SafeOrDeadApp(App):
     def build(self):
-        self.balance = 100
+        # tracing is installed before any traced screen or widget exists, and not at all when off
+        self.tracer = None
+        if TRACE_PATH:
+            self.tracer = Tracer()
+            for owner, attributes in TRACED.items():
+                self.tracer.install(owner, attributes)
+            # post_idle is the part of a Clock tick that runs scheduled callbacks, without the fps wait
+            self.tracer.install(Clock, ['post_idle'], label='Clock')
+            self.tracer.install_frames(EventLoop, Clock)
+        # the balance survives restarts: it is replayed from the ledger in the user data dir
+        self.ledger = Ledger(os.path.join(self.user_data_dir, 'ledger'))
+        variant = load_variants()[VARIANT]
+        self.exposure = Exposure(variant, int(MAX_LIABILITY) if MAX_LIABILITY else None)
+        self.engine = GameEngine(variant=variant, ledger=self.ledger, exposure=self.exposure)
+        # board drawing and journal writes run on worker threads; results are applied each frame
+        self.workers = WorkerPipeline()
+        Clock.schedule_interval(lambda dt: self.workers.poll(), 0)
+        self.boards = BoardSupply(self.workers, self.engine.variant)
+        self.frame_timer = FrameTimer()
+        # every session is journaled so a reported balance can be replayed with journal.py
+        journal_dir = os.path.join(self.user_data_dir, 'journal')
+        self.journal = Journal(os.path.join(journal_dir, time.strftime('%Y%m%d-%H%M%S') + f'-{os.getpid()}' + JOURNAL_SUFFIX),
+                               self.engine, self.workers)
+        prune(journal_dir)
+        # lifetime round statistics, snapshotted to disk every SNAPSHOT_EVERY rounds
+        self.analytics_path = os.path.join(self.user_data_dir, 'analytics.json')
+        self.analytics = self._load_analytics(self.engine.variant)
+        _death_counter(self.engine.variant.levels - 1)
+        self.metrics_server = METRICS.serve(int(METRICS_PORT)) if METRICS_PORT else None
         self.sound_enabled = True
-        self.button_sound = SoundLoader.load('button_click.wav')
-        sm = ScreenManager(transition=SlideTransition())
+        self.click_sound = None
+        self.startup = {}
+        sm = LazyScreenManager(transition=SlideTransition())
         sm.add_widget(IntroScreen(name='intro'))
-        sm.add_widget(MainMenuScreen(name='main_menu'))
-        sm.add_widget(InstructionsScreen(name='instructions'))
-        sm.add_widget(CreditsScreen(name='credits'))
-        sm.add_widget(GameScreen(name='game'))
-
+        for name, factory in (('main_menu', MainMenuScreen), ('instructions', InstructionsScreen), ('credits', CreditsScreen), ('game', GameScreen),
+                              ('parallel', ParallelScreen)):
+            sm.register(name, factory)
+        # the splash stays up only while the sound, menu and game screen are prepared
+        self.preloader = Preloader(self._preload(sm), lambda: self._interactive(sm))
         return sm
 
+    def _load_analytics(self, variant):
+        try:
+            stats = RoundStats.load(self.analytics_path)
+        except (OSError, ValueError, KeyError):
+            return RoundStats(variant.name, variant.levels)
+        if (stats.variant_name, stats.levels) != (variant.name, variant.levels):
+            return RoundStats(variant.name, variant.levels)
+        return stats
+
+    def record_round(self, bet, paid, cleared, count=1):
+        self.analytics.record(bet, paid, cleared, count)
+        if self.analytics.rounds % SNAPSHOT_EVERY < count:
+            self.workers.submit_serial(self.analytics.save, self.analytics_path)
+
+    def _preload(self, sm):
+        self.click_sound = VoicePool(load_voices('button_click.wav'))
+        yield
+        sm.get_screen('main_menu')
+        yield
+        factory = sm.factories.pop('game', None)
+        if factory is not None:
+            screen = factory(name='game', staged=True)
+            yield from screen.setup_steps
+            sm.add_widget(screen)
+
+    def _interactive(self, sm):
+        sm.current = 'main_menu'
+        self._record_startup('interactive')
+        if AUTOPLAY:
+            sm.current = 'game'
+            self.autoplayer = Autoplayer(sm.get_screen('game'), parse_strategy(AUTOPLAY))
+
+    def _record_startup(self, event):
+        self.startup[event] = time.perf_counter() - STARTED
+        Logger.info(f'Startup: {event} after {self.startup[event] * 1e3:.0f} ms')
+
+    def on_start(self):
+        self.root_window.bind(on_flip=self._first_frame)
+
+    def _first_frame(self, window):
+        window.unbind(on_flip=self._first_frame)
+        self._record_startup('first_frame')
+
+    def on_stop(self):
+        if self.click_sound is not None:
+            self.click_sound.close()
+            played, steals, p50, p99, worst = self.click_sound.stats()
+            Logger.info(f'Audio: {played} clicks, {steals} voices stolen, latency p50 {p50 * 1e3:.2f} ms '
+                        f'p99 {p99 * 1e3:.2f} ms max {worst * 1e3:.2f} ms')
+        Logger.info(f'Frames: {self.frame_timer.summary()}')
+        Logger.info(f'Exposure: {self.exposure.summary()}')
+        if self.tracer is not None:
+            self.tracer.uninstall()
+            self.tracer.dump(TRACE_PATH)
+            for line in self.tracer.summary().splitlines():
+                Logger.info(f'Trace: {line}')
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+        self.workers.close()
+        self.analytics.save(self.analytics_path)
+        Logger.info(f'Analytics: {self.analytics.report().splitlines()[0]}')
+        self.journal.close()
+        self.ledger.close()
+
 if __name__ == '__main__':
     SafeOrDeadApp().run()
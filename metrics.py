@@ -0,0 +1,123 @@
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.016, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0) # seconds
+
+# slots[base:base + len(bounds) + 1] count observations per bucket (the last is +Inf), the next one sums them
+Histogram = namedtuple('Histogram', 'base bounds')
+_Metric = namedtuple('_Metric', 'name kind help labels base bounds')
+
+class Metrics:
+    # Counters and histograms as slots in one list of numbers per thread: an update is an
+    # index into the calling thread's own list with no lock, and render() sums the lists of
+    # every thread that ever recorded, live or not, into Prometheus text format.
+    def __init__(self):
+        self._metrics = []
+        self._size = 0
+        self._threads = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _register(self, name, kind, help, labels, size, bounds=()):
+        with self._lock:
+            base = self._size
+            self._metrics.append(_Metric(name, kind, help, labels or {}, base, bounds))
+            self._size += size
+        return base
+
+    def counter(self, name, help, labels=None):
+        return self._register(name, 'counter', help, labels, 1)
+
+    def histogram(self, name, help, buckets=LATENCY_BUCKETS, labels=None):
+        bounds = tuple(sorted(buckets))
+        return Histogram(self._register(name, 'histogram', help, labels, len(bounds) + 2, bounds), bounds)
+
+    def _values(self):
+        # the calling thread's slots, created on its first update and grown for metrics
+        # registered since
+        values = getattr(self._local, 'values', None)
+        if values is None:
+            values = self._local.values = []
+            with self._lock:
+                self._threads.append(values)
+        values.extend([0] * (self._size - len(values)))
+        return values
+
+    def inc(self, slot, amount=1):
+        try:
+            self._local.values[slot] += amount
+        except (AttributeError, IndexError):
+            self._values()[slot] += amount
+
+    def observe(self, histogram, value):
+        base, bounds = histogram
+        try:
+            values = self._local.values
+            values[base + bisect_left(bounds, value)] += 1
+            values[base + len(bounds) + 1] += value
+        except (AttributeError, IndexError):
+            values = self._values()
+            values[base + bisect_left(bounds, value)] += 1
+            values[base + len(bounds) + 1] += value
+
+    def totals(self):
+        with self._lock:
+            threads = list(self._threads)
+        totals = [0] * self._size
+        for values in threads:
+            for slot, value in enumerate(values[:]):
+                totals[slot] += value
+        return totals
+
+    def render(self):
+        totals = self.totals()
+        lines = []
+        described = set()
+        for metric in self._metrics:
+            if metric.name not in described:
+                described.add(metric.name)
+                lines.append(f'# HELP {metric.name} {metric.help}')
+                lines.append(f'# TYPE {metric.name} {metric.kind}')
+            if metric.kind == 'counter':
+                lines.append(f'{metric.name}{_labels(metric.labels)} {totals[metric.base]}')
+                continue
+            cumulative = 0
+            for i, bound in enumerate(metric.bounds + (float('inf'),)):
+                cumulative += totals[metric.base + i]
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{metric.name}_bucket{_labels(dict(metric.labels, le=le))} {cumulative}')
+            lines.append(f'{metric.name}_sum{_labels(metric.labels)} {totals[metric.base + len(metric.bounds) + 1]}')
+            lines.append(f'{metric.name}_count{_labels(metric.labels)} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port, host='127.0.0.1'):
+        # GET /metrics on a daemon thread; returns the server for shutdown()
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+        return server
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
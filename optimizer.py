@@ -0,0 +1,121 @@
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from engine import TILES, DEAD_COUNTS, DEFAULT_BET, MAX_BET
+from solver import solve
+
+OVERSHOOT_PENALTY = 10 # paying out above the target costs the house, so it weighs more than undershooting
+SPREAD_WEIGHT = 0.25
+
+def is_valid(table, max_payout, min_step=0.01, min_multiplier=1.0):
+    if table[0] < min_multiplier or table[-1] > max_payout:
+        return False
+    return all(b - a >= min_step - 1e-9 for a, b in zip(table, table[1:]))
+
+def repair(table, max_payout, min_step=0.01, min_multiplier=1.0):
+    # rounds to cents and pushes each level at least min_step above the one below it
+    fixed = []
+    floor = min_multiplier
+    for m in table:
+        m = round(max(m, floor), 2)
+        fixed.append(m)
+        floor = m + min_step
+    if fixed[-1] > max_payout:
+        return None
+    return fixed
+
+def score(table, dead_counts, tiles, target_rtp, bets):
+    # the house edge has to hold against the best cash-out level at every bet size, and
+    # keeping the other levels near the target stops any of them being a trap
+    worst = 0.0
+    spread = 0.0
+    for bet in bets:
+        solution = solve(table, dead_counts, tiles, bet)
+        worst = max(worst, solution.optimal.rtp)
+        spread += sum(abs(p.rtp - target_rtp) for p in solution.policies) / len(solution.policies)
+    overshoot = max(0.0, worst - target_rtp)
+    return abs(worst - target_rtp) + OVERSHOOT_PENALTY * overshoot + SPREAD_WEIGHT * spread / len(bets)
+
+def seed_table(dead_counts, tiles, target_rtp, max_payout, min_step=0.01, min_multiplier=1.0):
+    # every level at exactly the target RTP, ignoring rounding, capped at max_payout
+    table = []
+    reach = 1.0
+    for dead in dead_counts:
+        reach *= (tiles - dead) / tiles
+        table.append(min(target_rtp / reach, max_payout) if reach else max_payout)
+    fixed = repair(table, max_payout, min_step, min_multiplier)
+    if fixed is None:
+        raise ValueError('No monotone table fits under the payout cap')
+    return fixed
+
+def mutate(table, rng, max_payout, min_step=0.01, min_multiplier=1.0, scale=0.05):
+    candidate = list(table)
+    for _ in range(rng.randint(1, 3)):
+        k = rng.randrange(len(candidate))
+        candidate[k] *= rng.lognormvariate(0, scale)
+    return repair(candidate, max_payout, min_step, min_multiplier)
+
+def optimize(target_rtp, max_payout, dead_counts=DEAD_COUNTS, tiles=TILES, bets=(DEFAULT_BET, 100, MAX_BET),
+             generations=100, population=256, elite=16, min_step=0.01, min_multiplier=1.0,
+             workers=None, seed=None):
+    # generator: yields (generation, score, table) every time a better table is found
+    rng = random.Random(seed)
+    evaluate = partial(score, dead_counts=tuple(dead_counts), tiles=tiles, target_rtp=target_rtp, bets=tuple(bets))
+    start = seed_table(dead_counts, tiles, target_rtp, max_payout, min_step, min_multiplier)
+    survivors = [(evaluate(start), start)]
+    best_score = survivors[0][0]
+    yield 0, best_score, start
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for generation in range(1, generations + 1):
+            candidates = []
+            while len(candidates) < population:
+                _, parent = survivors[rng.randrange(len(survivors))]
+                scale = rng.choice((0.005, 0.02, 0.08))
+                child = mutate(parent, rng, max_payout, min_step, min_multiplier, scale)
+                if child is not None and is_valid(child, max_payout, min_step, min_multiplier):
+                    candidates.append(child)
+
+            chunksize = max(1, len(candidates) // (workers * 4))
+            scored = list(zip(executor.map(evaluate, candidates, chunksize=chunksize), candidates))
+            survivors = sorted(survivors + scored)[:elite]
+            if survivors[0][0] < best_score:
+                best_score = survivors[0][0]
+                yield generation, best_score, survivors[0][1]
+
+def _parse_ints(text):
+    return [int(x) for x in text.split(',')]
+
+def main():
+    parser = argparse.ArgumentParser(description='Search for MULTIPLIERS tables that hit a target RTP')
+    parser.add_argument('--target-rtp', type=float, required=True)
+    parser.add_argument('--max-payout', type=float, required=True, help='cap on the top multiplier')
+    parser.add_argument('--min-step', type=float, default=0.01, help='minimum increase from one level to the next')
+    parser.add_argument('--dead-counts', type=_parse_ints, default=DEAD_COUNTS)
+    parser.add_argument('--tiles', type=int, default=TILES)
+    parser.add_argument('--bets', type=_parse_ints, default=[DEFAULT_BET, 100, MAX_BET],
+                        help='bet sizes to check, since payouts are truncated to whole coins')
+    parser.add_argument('--generations', type=int, default=100)
+    parser.add_argument('--population', type=int, default=256)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    best = None
+    for generation, best_score, table in optimize(
+            args.target_rtp, args.max_payout, args.dead_counts, args.tiles, args.bets,
+            args.generations, args.population, min_step=args.min_step,
+            workers=args.workers, seed=args.seed):
+        print(f'generation {generation}: score={best_score:.6f} {table}', flush=True)
+        best = table
+
+    solution = solve(best, args.dead_counts, args.tiles)
+    print(f'\nMULTIPLIERS = {best}')
+    print('RTP per cash-out level: ' + ' '.join(f'{p.rtp:.4f}' for p in solution.policies))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+import argparse
+import asyncio
+import json
+import random
+import signal
+
+from engine import GameEngine, GameState, PickResult, load_variants, dead_positions
+from exposure import Exposure
+from fairness import SeedPool, FairSession, round_record
+
+MAX_LINE = 1024 # requests are tiny; anything longer is dropped with the connection
+OPS_HOST = '127.0.0.1' # the house's ops listener never binds beyond this machine
+
+class Session:
+    __slots__ = ('engine', 'fair')
+
+    def __init__(self, engine, fair=None):
+        self.engine = engine
+        self.fair = fair
+
+class GameServer:
+    # line-delimited JSON over TCP, one Session per connection:
+    #   {"op": "start", "bet": 10}  {"op": "pick", "position": 2}  {"op": "cash_out"}
+    #   {"op": "state"}  {"op": "restart"}  {"op": "reset_balance"}
+    #   {"op": "rotate_seed", "client_seed": "..."} (provably-fair mode only)
+    # and, only on the separate ops listener (serve's ops_port), never to players:
+    #   {"op": "exposure"} (the house's liability across every connection)
+    def __init__(self, variant, rng=None, fair=False, round_log=None, max_liability=None, max_player_liability=None):
+        self.variant = variant
+        self.rng = rng if rng is not None else random.Random()
+        self.seed_pool = SeedPool() if fair else None
+        self.round_log = round_log # file object receiving one JSON line per fair round
+        self.exposure = Exposure(variant, max_liability, max_player_liability)
+        self.sessions = 0
+        self.connections = 0 # ever accepted; numbers each connection's exposure account
+        self._open = {} # handler task -> its writer, for closing them all on shutdown
+        self._ops = {
+            'start': self._start,
+            'pick': self._pick,
+            'cash_out': self._cash_out,
+            'state': self._state,
+            'restart': self._restart,
+            'reset_balance': self._reset_balance,
+            'rotate_seed': self._rotate_seed,
+        }
+        self._house_ops = {
+            'exposure': self._exposure,
+        }
+
+    async def serve(self, host, port, ops_port=None, stop=None):
+        # runs until stop (an asyncio.Event) is set; then the listeners close, every open
+        # connection is closed and its handler finishes (forfeiting any active round)
+        servers = [await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)]
+        if ops_port is not None:
+            servers.append(await asyncio.start_server(self._handle_ops, OPS_HOST, ops_port, limit=MAX_LINE))
+        try:
+            await (stop if stop is not None else asyncio.Event()).wait()
+        finally:
+            for server in servers:
+                server.close()
+            # lets handlers of connections accepted just now start and register
+            await asyncio.sleep(0)
+            for writer in list(self._open.values()):
+                writer.close()
+            await asyncio.gather(*self._open, return_exceptions=True)
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        session = Session(
+            GameEngine(rng=self.rng, variant=self.variant, account=f'connection-{self.connections}', exposure=self.exposure),
+            FairSession(self.seed_pool) if self.seed_pool else None,
+        )
+        self.sessions += 1
+        self._open[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                writer.write(self.dispatch(session, line))
+                if writer.transport.get_write_buffer_size() > MAX_LINE * 16:
+                    await writer.drain()
+        finally:
+            # a round left open is forfeited, which also takes it off the house's exposure
+            if session.engine.game_state == GameState.ACTIVE:
+                session.engine.bust()
+            self.sessions -= 1
+            del self._open[asyncio.current_task()]
+            writer.close()
+
+    async def _handle_ops(self, reader, writer):
+        self._open[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                writer.write(self.dispatch(None, line, self._house_ops))
+                await writer.drain()
+        finally:
+            del self._open[asyncio.current_task()]
+            writer.close()
+
+    def dispatch(self, session, line, ops=None):
+        try:
+            request = json.loads(line)
+            handler = (ops if ops is not None else self._ops)[request['op']]
+            response = handler(session, request)
+        except json.JSONDecodeError:
+            response = {'ok': False, 'error': 'Bad request'}
+        except (ValueError, RuntimeError) as e:
+            response = {'ok': False, 'error': str(e)}
+        except (KeyError, TypeError):
+            response = {'ok': False, 'error': 'Bad request'}
+        return json.dumps(response, separators=(',', ':')).encode() + b'\n'
+
+    def _snapshot(self, session, **extra):
+        engine = session.engine
+        response = {
+            'ok': True,
+            'state': engine.game_state.value,
+            'level': engine.level,
+            'balance': engine.balance,
+            'winnings': engine.current_winnings,
+        }
+        response.update(extra)
+        return response
+
+    def _reveal(self, session):
+        board = session.engine.board
+        return [dead_positions(board, level, self.variant.tiles) for level in range(self.variant.levels)]
+
+    def _start(self, session, request):
+        engine = session.engine
+        if engine.game_state == GameState.ACTIVE:
+            raise RuntimeError('Round already active')
+        bet = int(request['bet'])
+        error = engine.validate_bet(bet)
+        if error is None and engine.exposure is not None:
+            error = engine.exposure.check(engine.account, bet)
+        if error:
+            raise ValueError(error)
+        if session.fair is None:
+            engine.start_round(bet)
+            return self._snapshot(session)
+
+        # every check is done before the board is derived, so a refused round uses no nonce
+        fair = session.fair
+        board, nonce = fair.next_board(self.variant)
+        engine.start_round(bet, board)
+        if self.round_log is not None:
+            self.round_log.write(round_record(fair, nonce, board, self.variant) + '\n')
+        return self._snapshot(session, commitment=fair.commitment, client_seed=fair.client_seed, nonce=nonce)
+
+    def _pick(self, session, request):
+        position = request['position']
+        if type(position) is not int:
+            raise ValueError('Invalid position')
+        result = session.engine.pick(position)
+        if result == PickResult.SAFE:
+            return self._snapshot(session, result=result.value)
+        return self._snapshot(session, result=result.value, dead=self._reveal(session))
+
+    def _cash_out(self, session, request):
+        winnings = session.engine.cash_out()
+        return self._snapshot(session, paid=winnings, dead=self._reveal(session))
+
+    def _state(self, session, request):
+        return self._snapshot(session)
+
+    def _restart(self, session, request):
+        if session.engine.game_state == GameState.ACTIVE:
+            raise RuntimeError('Round still active')
+        session.engine.reset_round()
+        return self._snapshot(session)
+
+    def _reset_balance(self, session, request):
+        if session.engine.game_state == GameState.ACTIVE:
+            raise RuntimeError('Round still active')
+        session.engine.reset_balance()
+        return self._snapshot(session)
+
+    def _rotate_seed(self, session, request):
+        if session.fair is None:
+            raise RuntimeError('Provably-fair mode is off')
+        if session.engine.game_state == GameState.ACTIVE:
+            raise RuntimeError('Round still active')
+        client_seed = request.get('client_seed')
+        if client_seed is not None and (type(client_seed) is not str or len(client_seed) > 64):
+            raise ValueError('Invalid client seed')
+        revealed = session.fair.rotate(client_seed)
+        return self._snapshot(
+            session, revealed_server_seed=revealed.hex(),
+            commitment=session.fair.commitment, client_seed=session.fair.client_seed,
+        )
+
+    def _exposure(self, session, request):
+        exposure = self.exposure
+        return {
+            'ok': True,
+            'rounds': sum(exposure.rounds),
+            'liability': exposure.liability,
+            'worst_case': exposure.worst_case,
+            'levels': list(exposure.level_liability),
+            'players': len(exposure.players),
+        }
+
+async def _serve_until_signalled(server, args):
+    # SIGTERM and Ctrl-C both stop the server from inside the loop, so no handler is
+    # interrupted mid-request and the round log is closed after the last round
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    await server.serve(args.host, args.port, args.ops_port, stop)
+
+def main():
+    parser = argparse.ArgumentParser(description='SAFE or DEAD game server (line-delimited JSON over TCP)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--variant', default='classic')
+    parser.add_argument('--fair', action='store_true', help='derive boards from committed server/client seeds')
+    parser.add_argument('--round-log', default=None, help='append fair rounds here for fairness.py verify')
+    parser.add_argument('--max-liability', type=int, default=None, help='refuse rounds that would put more than this in jackpots at risk')
+    parser.add_argument('--max-player-liability', type=int, default=None, help='the same limit per connection')
+    parser.add_argument('--ops-port', type=int, default=None, help=f'serve house-only requests (exposure) on {OPS_HOST} here')
+    args = parser.parse_args()
+
+    # line-buffered: each round's seeds and commitment reach the file before its response does
+    round_log = open(args.round_log, 'a', buffering=1) if args.round_log else None
+    server = GameServer(load_variants()[args.variant], fair=args.fair or round_log is not None, round_log=round_log,
+                        max_liability=args.max_liability, max_player_liability=args.max_player_liability)
+    try:
+        asyncio.run(_serve_until_signalled(server, args))
+    finally:
+        if round_log is not None:
+            round_log.close()
+
+if __name__ == '__main__':
+    main()
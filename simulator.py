@@ -0,0 +1,129 @@
+import argparse
+
+import numpy as np
+
+from engine import TILES, MULTIPLIERS, DEAD_COUNTS, DEFAULT_BET, load_variants
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+class StrategyStats:
+    def __init__(self, cash_out_level, levels):
+        self.cash_out_level = cash_out_level
+        self.rounds = 0
+        self.staked = 0
+        self.paid = 0
+        self.mean = 0.0 # net return per unit bet
+        self.m2 = 0.0
+        self.levels_reached = np.zeros(levels + 1, dtype=np.int64)
+        self._bankroll = 0
+        self._peak = 0
+        self.max_drawdown = 0
+
+    @property
+    def rtp(self):
+        return self.paid / self.staked if self.staked else 0.0
+
+    @property
+    def variance(self):
+        return self.m2 / (self.rounds - 1) if self.rounds > 1 else 0.0
+
+    def update(self, levels_cleared, bets, payouts):
+        n = bets.shape[0]
+        net = payouts - bets
+        returns = net / bets
+
+        # Chan et al. merge of the chunk's moments into the running ones
+        chunk_mean = returns.mean()
+        chunk_m2 = ((returns - chunk_mean) ** 2).sum()
+        total = self.rounds + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.rounds * n / total
+        self.rounds = total
+
+        self.staked += int(bets.sum())
+        self.paid += int(payouts.sum())
+        self.levels_reached += np.bincount(levels_cleared, minlength=self.levels_reached.shape[0])
+
+        bankroll = self._bankroll + np.cumsum(net)
+        peak = np.maximum(np.maximum.accumulate(bankroll), self._peak)
+        self.max_drawdown = max(self.max_drawdown, int((peak - bankroll).max()))
+        self._bankroll = int(bankroll[-1])
+        self._peak = int(peak[-1])
+
+    def report(self):
+        dist = ' '.join(f'{count / self.rounds:.4f}' for count in self.levels_reached)
+        return (
+            f'cash out at level {self.cash_out_level}: rounds={self.rounds:,} '
+            f'RTP={self.rtp:.5f} variance={self.variance:.4f} '
+            f'max drawdown={self.max_drawdown:,} coins\n'
+            f'  levels cleared 0..{self.levels_reached.shape[0] - 1}: {dist}'
+        )
+
+def simulate(rounds, cash_out_levels, multipliers=MULTIPLIERS, dead_counts=DEAD_COUNTS,
+             tiles=TILES, bet=DEFAULT_BET, chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    levels = len(multipliers)
+    if len(dead_counts) != levels:
+        raise ValueError('multipliers and dead_counts must have one entry per level')
+    if any(not 0 <= dead < tiles for dead in dead_counts):
+        raise ValueError(f'Dead counts must be between 0 and {tiles - 1}')
+    if any(not 1 <= level <= levels for level in cash_out_levels):
+        raise ValueError(f'Cash-out level must be between 1 and {levels}')
+
+    rng = np.random.default_rng(seed)
+    payout_table = np.array([int(bet * m) for m in multipliers], dtype=np.int64)
+    dead = np.array(dead_counts, dtype=np.int16)
+    rank_dtype = np.int8 if tiles <= 127 else np.int16
+    stats = [StrategyStats(level, levels) for level in cash_out_levels]
+
+    remaining = rounds
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        remaining -= n
+
+        # every strategy plays the same boards (common random numbers), so the
+        # comparison between strategies is not swamped by sampling noise
+        ranks = rng.integers(0, tiles, size=(n, levels), dtype=rank_dtype)
+        hit = ranks < dead
+        first_dead = np.where(hit.any(axis=1), hit.argmax(axis=1), levels)
+        bets = np.full(n, bet, dtype=np.int64)
+
+        for s in stats:
+            won = first_dead >= s.cash_out_level
+            levels_cleared = np.minimum(first_dead, s.cash_out_level)
+            payouts = np.where(won, payout_table[s.cash_out_level - 1], 0)
+            s.update(levels_cleared, bets, payouts)
+
+    return stats
+
+def _parse_floats(text):
+    return [float(x) for x in text.split(',')]
+
+def _parse_ints(text):
+    return [int(x) for x in text.split(',')]
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo check of a SAFE or DEAD payout table')
+    parser.add_argument('--rounds', type=lambda x: int(float(x)), default=10_000_000)
+    parser.add_argument('--variant', default=None, help='take the tables from variants.json')
+    parser.add_argument('--multipliers', type=_parse_floats, default=MULTIPLIERS)
+    parser.add_argument('--dead-counts', type=_parse_ints, default=DEAD_COUNTS)
+    parser.add_argument('--tiles', type=int, default=TILES)
+    parser.add_argument('--bet', type=int, default=DEFAULT_BET)
+    parser.add_argument('--strategies', type=_parse_ints, default=None,
+                        help='comma-separated cash-out levels (default: every level)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+    if args.variant:
+        variant = load_variants()[args.variant]
+        args.multipliers, args.dead_counts, args.tiles = variant.multipliers, variant.dead_counts, variant.tiles
+
+    strategies = args.strategies or list(range(1, len(args.multipliers) + 1))
+    stats = simulate(args.rounds, strategies, args.multipliers, args.dead_counts,
+                     args.tiles, args.bet, args.chunk_size, args.seed)
+    for s in stats:
+        print(s.report())
+
+if __name__ == '__main__':
+    main()
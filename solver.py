@@ -0,0 +1,110 @@
+import argparse
+from collections import namedtuple
+from fractions import Fraction
+from functools import lru_cache
+
+from engine import TILES, MULTIPLIERS, DEAD_COUNTS, load_variants
+
+CACHE_SIZE = 4096
+
+# payout_distribution holds (coins returned per unit bet, probability) pairs;
+# levels_cleared[j] is the probability the round ends with exactly j levels cleared
+Policy = namedtuple('Policy', 'cash_out_level rtp ev variance payout_distribution levels_cleared')
+Solution = namedtuple('Solution', 'multipliers dead_counts tiles survival reach policies optimal')
+
+def solve(multipliers=MULTIPLIERS, dead_counts=DEAD_COUNTS, tiles=TILES, bet=None):
+    # bet=None uses the raw multipliers; an integer bet applies the game's int() truncation
+    return _solve(tuple(multipliers), tuple(dead_counts), tiles, bet)
+
+def cache_info():
+    return _solve.cache_info()
+
+def cache_clear():
+    _solve.cache_clear()
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _solve(multipliers, dead_counts, tiles, bet):
+    levels = len(multipliers)
+    if len(dead_counts) != levels:
+        raise ValueError('multipliers and dead_counts must have one entry per level')
+    if any(not 0 <= dead <= tiles for dead in dead_counts):
+        raise ValueError(f'Dead counts must be between 0 and {tiles}')
+
+    if bet is None:
+        payouts = [Fraction(str(m)) for m in multipliers]
+    else:
+        payouts = [Fraction(int(bet * m), bet) for m in multipliers]
+    survival = [Fraction(tiles - dead, tiles) for dead in dead_counts]
+    reach = []
+    p = Fraction(1)
+    for s in survival:
+        p *= s
+        reach.append(p)
+
+    policies = tuple(_policy(k, payouts, survival, reach) for k in range(1, levels + 1))
+
+    # backward induction: value[k] is the expected payout of the best continuation
+    # after clearing k levels; clearing the last level pays the jackpot
+    value = payouts[-1]
+    optimal = levels
+    for k in range(levels - 1, 0, -1):
+        keep_going = survival[k] * value
+        if payouts[k - 1] >= keep_going:
+            value = payouts[k - 1]
+            optimal = k
+        else:
+            value = keep_going
+
+    return Solution(
+        multipliers, dead_counts, tiles,
+        tuple(float(s) for s in survival),
+        tuple(float(r) for r in reach),
+        policies,
+        policies[optimal - 1],
+    )
+
+def _policy(cash_out_level, payouts, survival, reach):
+    win = reach[cash_out_level - 1]
+    payout = payouts[cash_out_level - 1]
+    rtp = win * payout
+    variance = win * payout * payout - rtp * rtp
+
+    levels_cleared = []
+    reached = Fraction(1)
+    for j in range(cash_out_level):
+        levels_cleared.append(float(reached * (1 - survival[j])))
+        reached *= survival[j]
+    levels_cleared.append(float(win))
+
+    distribution = ((float(payout), float(win)),)
+    if win != 1:
+        distribution += ((0.0, float(1 - win)),)
+    return Policy(cash_out_level, float(rtp), float(rtp - 1), float(variance), distribution, tuple(levels_cleared))
+
+def _parse_floats(text):
+    return [float(x) for x in text.split(',')]
+
+def _parse_ints(text):
+    return [int(x) for x in text.split(',')]
+
+def main():
+    parser = argparse.ArgumentParser(description='Exact RTP of every cash-out level of a SAFE or DEAD payout table')
+    parser.add_argument('--variant', default=None, help='take the tables from variants.json')
+    parser.add_argument('--multipliers', type=_parse_floats, default=MULTIPLIERS)
+    parser.add_argument('--dead-counts', type=_parse_ints, default=DEAD_COUNTS)
+    parser.add_argument('--tiles', type=int, default=TILES)
+    parser.add_argument('--bet', type=int, default=None)
+    args = parser.parse_args()
+    if args.variant:
+        variant = load_variants()[args.variant]
+        args.multipliers, args.dead_counts, args.tiles = variant.multipliers, variant.dead_counts, variant.tiles
+
+    solution = solve(args.multipliers, args.dead_counts, args.tiles, args.bet)
+    print('| Level | p_i | P(reach level) | Multiplier | RTP | EV (net per 1 bet) | Variance |')
+    print('| --- | --- | --- | --- | --- | --- | --- |')
+    for policy, s, r, m in zip(solution.policies, solution.survival, solution.reach, solution.multipliers):
+        print(f'| {policy.cash_out_level} | {s:.2f} | {r:.6f} | {m:.2f} | {policy.rtp:.4f} | {policy.ev:.3f} | {policy.variance:.3f} |')
+    print(f'\nOptimal policy: cash out at level {solution.optimal.cash_out_level} (EV {solution.optimal.ev:.3f})')
+
+if __name__ == '__main__':
+    main()
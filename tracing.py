@@ -0,0 +1,144 @@
+import functools
+import json
+import os
+import time
+from array import array
+
+TRACE_CAPACITY = 1 << 16 # spans kept; the oldest are overwritten
+FRAME_BUDGET = 0.016 # seconds of work a frame may take and still make 60 fps
+TRACE_PATH = os.environ.get('SAFE_OR_DEAD_TRACE') # Chrome trace written here on exit; unset turns tracing off
+
+# span rows in the trace viewer
+CALLBACKS, FRAMES, MISSED = 0, 1, 2
+_ROWS = {CALLBACKS: 'callbacks', FRAMES: 'frames', MISSED: 'missed frames'}
+
+class Tracer:
+    # Opt-in span recorder. install() swaps methods for timing wrappers, so nothing is touched
+    # while tracing is off. Spans land in preallocated ring buffers (name id, row, start and
+    # duration), and dump() writes the newest as Chrome trace JSON for chrome://tracing or
+    # Perfetto. Meant for the UI thread: the buffers are not locked.
+    def __init__(self, capacity=TRACE_CAPACITY, frame_budget=FRAME_BUDGET):
+        self.capacity = capacity
+        self.frame_budget = frame_budget
+        self.names = []
+        self.recorded = 0
+        self.frames = 0
+        self.missed = 0
+        self._ids = {}
+        self._name_ids = array('H', bytes(2 * capacity))
+        self._rows = array('B', bytes(capacity))
+        self._starts = array('d', bytes(8 * capacity))
+        self._durations = array('d', bytes(8 * capacity))
+        self._installed = [] # (owner, attribute, what was there)
+        self._waited = 0.0
+
+    def name_id(self, name):
+        if name not in self._ids:
+            self._ids[name] = len(self.names)
+            self.names.append(name)
+        return self._ids[name]
+
+    def add(self, name_id, start, duration, row=CALLBACKS):
+        i = self.recorded % self.capacity
+        self._name_ids[i] = name_id
+        self._rows[i] = row
+        self._starts[i] = start
+        self._durations[i] = duration
+        self.recorded += 1
+
+    def _patch(self, owner, attribute, replacement):
+        self._installed.append((owner, attribute, owner.__dict__.get(attribute) if isinstance(owner, type) else None))
+        setattr(owner, attribute, replacement)
+
+    def traced(self, fn, name):
+        name_id = self.name_id(name)
+        clock = time.perf_counter
+        add = self.add
+
+        @functools.wraps(fn)
+        def traced(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                add(name_id, start, clock() - start)
+        return traced
+
+    def install(self, owner, attributes, label=None):
+        # owner is a class (every instance, including callbacks bound to its methods later)
+        # or an object (that object only)
+        if label is None:
+            label = owner.__name__ if isinstance(owner, type) else type(owner).__name__
+        for attribute in attributes:
+            self._patch(owner, attribute, self.traced(getattr(owner, attribute), f'{label}.{attribute}'))
+
+    def install_frames(self, event_loop, clock):
+        # a frame is one EventLoop.idle (clock tick, input, draw, flip) less the time the
+        # Clock slept to cap the frame rate; work past frame_budget is flagged as missed
+        timer = time.perf_counter
+        frame_id = self.name_id('frame')
+        missed_id = self.name_id(f'missed frame (> {self.frame_budget * 1e3:.0f} ms)')
+        wait = clock.idle
+        idle = event_loop.idle
+
+        def clock_idle():
+            start = timer()
+            try:
+                return wait()
+            finally:
+                self._waited += timer() - start
+
+        def frame():
+            self._waited = 0.0
+            start = timer()
+            try:
+                return idle()
+            finally:
+                work = timer() - start - self._waited
+                self.frames += 1
+                self.add(frame_id, start + self._waited, work, FRAMES)
+                if work > self.frame_budget:
+                    self.missed += 1
+                    self.add(missed_id, start + self._waited, work, MISSED)
+        self._patch(clock, 'idle', clock_idle)
+        self._patch(event_loop, 'idle', frame)
+
+    def uninstall(self):
+        for owner, attribute, original in reversed(self._installed):
+            if original is not None:
+                setattr(owner, attribute, original)
+            else:
+                delattr(owner, attribute)
+        self._installed = []
+
+    def spans(self):
+        # (name, row, start, duration) for the spans still in the buffers, oldest first
+        count = min(self.recorded, self.capacity)
+        first = self.recorded - count
+        for k in range(first, self.recorded):
+            i = k % self.capacity
+            yield self.names[self._name_ids[i]], self._rows[i], self._starts[i], self._durations[i]
+
+    def dump(self, path):
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': row, 'args': {'name': name}}
+                  for row, name in _ROWS.items()]
+        for name, row, start, duration in self.spans():
+            event = {'name': name, 'ph': 'X', 'pid': pid, 'tid': row, 'ts': start * 1e6, 'dur': duration * 1e6}
+            if row == MISSED:
+                event['cname'] = 'terrible'
+            events.append(event)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def summary(self):
+        # slowest average callbacks first
+        totals = {}
+        for name, row, _, duration in self.spans():
+            if row == CALLBACKS:
+                count, total, worst = totals.get(name, (0, 0.0, 0.0))
+                totals[name] = (count + 1, total + duration, max(worst, duration))
+        lines = [f'{self.frames:,} frames, {self.missed:,} over {self.frame_budget * 1e3:.0f} ms']
+        for name, (count, total, worst) in sorted(totals.items(), key=lambda item: -item[1][1] / item[1][0]):
+            lines.append(f'{name:40s} {count:6,} calls  mean {total / count * 1e3:7.3f} ms  max {worst * 1e3:7.3f} ms')
+        return '\n'.join(lines)
@@ -0,0 +1,93 @@
+import queue
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from engine import sample_board
+
+WORKERS = 2
+BOARD_RESERVE = 64 # boards drawn ahead; a refill starts when half are used
+POLL_BUDGET = 0.002 # seconds of result handling per poll() (one per frame in the app)
+
+class WorkerPipeline:
+    # Background jobs for the UI thread. submit() runs on a small thread pool, submit_serial()
+    # on one thread in submission order (for writes that must stay ordered). Results wait in a
+    # queue until poll() hands them to their on_done callbacks on the polling thread; a failed
+    # job re-raises there, even without a callback, rather than vanishing on a worker.
+    def __init__(self, workers=WORKERS):
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix='worker')
+        self._serial = ThreadPoolExecutor(1, thread_name_prefix='worker-serial')
+        self._results = queue.SimpleQueue()
+        self.submitted = 0
+        self.applied = 0
+
+    def _submit(self, executor, fn, args, on_done):
+        self.submitted += 1
+        future = executor.submit(fn, *args)
+        future.add_done_callback(lambda f: self._finished(on_done, f))
+        return future
+
+    def _finished(self, on_done, future):
+        if on_done is not None or future.exception() is not None:
+            self._results.put((on_done, future))
+
+    def submit(self, fn, *args, on_done=None):
+        return self._submit(self._pool, fn, args, on_done)
+
+    def submit_serial(self, fn, *args, on_done=None):
+        return self._submit(self._serial, fn, args, on_done)
+
+    def poll(self, budget=POLL_BUDGET):
+        deadline = time.perf_counter() + budget
+        applied = 0
+        while time.perf_counter() < deadline:
+            try:
+                on_done, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            result = future.result()
+            if on_done is not None:
+                on_done(result)
+            applied += 1
+        self.applied += applied
+        return applied
+
+    def close(self):
+        # ordered writes are finished; queued pool jobs are dropped
+        self._serial.shutdown(wait=True)
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+class BoardSupply:
+    # Boards drawn ahead of time on the pipeline, so starting a round takes one from a deque
+    # instead of sampling on the UI thread. take() returns None if the reserve ever runs dry.
+    def __init__(self, pipeline, variant, reserve=BOARD_RESERVE, rng=None):
+        self.pipeline = pipeline
+        self.variant = variant
+        self.reserve = reserve
+        self.rng = rng if rng is not None else random.Random() # used by one refill job at a time
+        self._boards = deque()
+        self._refilling = False
+        self._refill()
+
+    def _refill(self):
+        if self._refilling or len(self._boards) > self.reserve // 2:
+            return
+        self._refilling = True
+        self.pipeline.submit(self._draw, self.reserve - len(self._boards), on_done=self._stock)
+
+    def _draw(self, count):
+        variant = self.variant
+        return [sample_board(self.rng, variant.dead_counts, variant.tiles) for _ in range(count)]
+
+    def _stock(self, boards):
+        self._boards.extend(boards)
+        self._refilling = False
+
+    def take(self):
+        board = self._boards.popleft() if self._boards else None
+        self._refill()
+        return board
+
+    def __len__(self):
+        return len(self._boards)